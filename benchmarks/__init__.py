@@ -0,0 +1,16 @@
+# Copyright 2025 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Benchmarks for uw_msca, run as modules from the repository root, e.g.
+
+    python -m benchmarks.bench_drive_state_decoder 1000000
+"""
+
+from commonconf.backends import use_configparser_backend
+from os.path import abspath, dirname
+import os
+
+use_configparser_backend(
+    abspath(os.path.join(dirname(__file__), "..", "conf", "test.conf")),
+    'MSCA')
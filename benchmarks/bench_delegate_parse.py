@@ -0,0 +1,53 @@
+# Copyright 2025 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Compare parsing GetDelegates responses for mailboxes with many delegates:
+the stdlib json and Delegate Model baseline against the uw_msca.fastjson
+decoder with Delegate and DelegateRecord.
+
+    python -m benchmarks.bench_delegate_parse [delegates ...]
+"""
+
+import json
+import sys
+import time
+
+from benchmarks.fixtures import get_delegates_payload
+from uw_msca import fastjson
+from uw_msca.delegate import _delegates_from_get_delegates
+from uw_msca.models import Delegate, DelegateRecord
+
+
+def stdlib_models(payload):
+    data = json.loads(payload)
+    return [Delegate().from_json(data["netid"], d)
+            for d in data["delegates"]]
+
+
+def fast_models(payload):
+    return _delegates_from_get_delegates("javerage", payload, Delegate)
+
+
+def fast_records(payload):
+    return _delegates_from_get_delegates("javerage", payload, DelegateRecord)
+
+
+def main(*sizes):
+    print("json decoder: {}".format(
+        "orjson" if fastjson.orjson else "stdlib json"))
+    for delegates in sizes or (1000, 10000):
+        payload = get_delegates_payload("javerage", delegates)
+        repeat = max(1, 100000 // delegates)
+        for parse in (stdlib_models, fast_models, fast_records):
+            start = time.perf_counter()
+            for i in range(repeat):
+                parse(payload)
+            elapsed = (time.perf_counter() - start) / repeat
+            print("{:<14} {:>7} delegates {:9.2f}ms {:>10.0f} delegates/s"
+                  .format(parse.__name__, delegates, elapsed * 1000,
+                          delegates / elapsed))
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,51 @@
+# Copyright 2025 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Compare GoogleDriveState.from_csv on csv.DictReader rows against the
+precompiled GoogleDriveState.csv_decoder on csv.reader rows.
+
+    python -m benchmarks.bench_drive_state_decoder [rows]
+"""
+
+import csv
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.fixtures import write_drive_report
+from uw_msca.models import GoogleDriveState, GoogleDriveStateRecord
+
+
+def from_csv(path, record_class):
+    with open(path, newline="") as f:
+        for record in csv.DictReader(f):
+            record_class.from_csv(record)
+
+
+def csv_decoder(path, record_class):
+    with open(path, newline="") as f:
+        rows = csv.reader(f)
+        decode = record_class.csv_decoder(next(rows))
+        for row in rows:
+            decode(row)
+
+
+def main(rows=1000000):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "report.csv")
+        write_drive_report(path, rows)
+
+        for record_class in (GoogleDriveState, GoogleDriveStateRecord):
+            for parse in (from_csv, csv_decoder):
+                start = time.perf_counter()
+                parse(path, record_class)
+                elapsed = time.perf_counter() - start
+                print("{:<24} {:<12} {:>9} rows {:8.2f}s {:>10.0f} rows/s"
+                      .format(record_class.__name__, parse.__name__, rows,
+                              elapsed, rows / elapsed))
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
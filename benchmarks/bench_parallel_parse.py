@@ -0,0 +1,47 @@
+# Copyright 2025 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Scaling of multi-process drive state report parsing with process count.
+
+    python -m benchmarks.bench_parallel_parse [rows]
+"""
+
+import csv
+import io
+import os
+import sys
+import time
+
+from benchmarks.fixtures import drive_report_lines
+from uw_msca.drive_state_parser import parse_drive_states
+from uw_msca.models import GoogleDriveStateRecord
+
+
+def serial(data, record_class):
+    rows = csv.reader(io.StringIO(data.decode("utf-8"), newline=""))
+    decode = record_class.csv_decoder(next(rows))
+    return [decode(row) for row in rows if row]
+
+
+def main(rows=2000000):
+    data = "".join(drive_report_lines(rows)).encode("utf-8")
+    record_class = GoogleDriveStateRecord
+
+    start = time.perf_counter()
+    serial(data, record_class)
+    baseline = time.perf_counter() - start
+    print("{:>9} rows serial      {:8.2f}s".format(rows, baseline))
+
+    processes = 2
+    while processes <= (os.cpu_count() or 1):
+        start = time.perf_counter()
+        parse_drive_states(data, record_class, processes)
+        elapsed = time.perf_counter() - start
+        print("{:>9} rows {:>2} processes {:8.2f}s {:6.2f}x".format(
+            rows, processes, elapsed, baseline / elapsed))
+        processes *= 2
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
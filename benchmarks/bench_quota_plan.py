@@ -0,0 +1,38 @@
+# Copyright 2025 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Time shared_drive.plan_drive_quotas over a synthetic drive state report.
+
+    python -m benchmarks.bench_quota_plan [rows]
+"""
+
+import csv
+import sys
+import time
+
+from benchmarks.fixtures import drive_report_lines
+from uw_msca.models import GoogleDriveStateRecord
+from uw_msca.shared_drive import plan_drive_quotas
+
+
+def main(rows=1000000):
+    lines = drive_report_lines(rows)
+    reader = csv.reader(lines)
+    decode = GoogleDriveStateRecord.csv_decoder(next(reader))
+    drive_states = [decode(row) for row in reader]
+
+    policies = {
+        "callable": lambda drive_state: 200,
+        "mapping": {d.drive_id: 200 for d in drive_states[::3]},
+    }
+    for name, policy in policies.items():
+        start = time.perf_counter()
+        changes = plan_drive_quotas(policy, drive_states=drive_states)
+        elapsed = time.perf_counter() - start
+        print("{:<10} {:>9} rows {:>8} changes {:8.2f}s {:>10.0f} rows/s"
+              .format(name, rows, len(changes), elapsed, rows / elapsed))
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,93 @@
+# Copyright 2025 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Synthetic fixture generators for benchmarks.
+"""
+
+import json
+import random
+
+DRIVE_REPORT_HEADER = (
+    "id,drive_id,drive_name,member,role,total_members,total_uwowners,"
+    "org_unitID,org_unitName,query_date,size,file_count,size_query_date\r\n")
+
+ROLES = ("organizer", "fileOrganizer", "writer", "commenter", "reader")
+ORG_UNITS = ("100GB", "200GB", "500GB", "1000GB", "uw.edu")
+
+
+def drive_report_lines(rows, members_per_drive=4, seed=0):
+    """
+    Yield the lines of a synthetic PPLAT drive state report
+    """
+    rand = random.Random(seed)
+    yield DRIVE_REPORT_HEADER
+    row_id = 0
+    drive = 0
+    while row_id < rows:
+        drive += 1
+        drive_id = "0A{:017X}".format(drive)
+        members = rand.randint(1, members_per_drive * 2 - 1)
+        size = rand.randint(0, 1024 * 1024)
+        file_count = rand.randint(0, 10000)
+        org_unit = rand.choice(ORG_UNITS)
+        for m in range(min(members, rows - row_id)):
+            row_id += 1
+            yield (
+                f'{row_id},{drive_id},"Drive {drive}, shared",'
+                f'user{rand.randint(0, rows)}@uw.edu,{rand.choice(ROLES)},'
+                f'{members},{max(1, members // 2)},00gjdgxs{drive:07d},'
+                f'{org_unit},2024-04-03T00:00:00.508Z,{size},{file_count},'
+                f'2024-04-02T14:44:28.376Z\r\n')
+
+
+def write_drive_report(path, rows, **kwargs):
+    with open(path, "w", newline="") as f:
+        f.writelines(drive_report_lines(rows, **kwargs))
+
+
+ACCESS_RIGHTS = ("FullAccess", "SendAs", "SendOnBehalf", "FullAccessandSendAs")
+
+
+def delegate_csv_lines(rows, seed=0):
+    """
+    Yield the lines of a synthetic GetDelegateCsv all delegate export
+    """
+    rand = random.Random(seed)
+    yield "Identity,User,AccessRights\r\n"
+    for row in range(rows):
+        yield "user{},user{}@uw.edu,{}\r\n".format(
+            row // 3, rand.randint(0, rows), rand.choice(ACCESS_RIGHTS))
+
+
+def get_delegates_payload(netid, delegates, seed=0):
+    """
+    Return a synthetic GetDelegates response body listing delegates
+    delegates for netid
+    """
+    rand = random.Random(seed)
+    return json.dumps({
+        "netid": netid,
+        "delegates": [{
+            "User": "user{}@uw.edu".format(i),
+            "AccessRights": rand.choice(ACCESS_RIGHTS),
+        } for i in range(delegates)],
+    }).encode("utf-8")
+
+
+class StreamingResponse:
+    """
+    Stands in for a urllib3 response to an external resource request,
+    streaming data in chunks
+    """
+    def __init__(self, data, status=200):
+        self.status = status
+        self.data = data
+        self.headers = {}
+
+    def stream(self, chunk_size):
+        for start in range(0, len(self.data), chunk_size):
+            yield self.data[start:start + chunk_size]
+
+    def release_conn(self):
+        pass
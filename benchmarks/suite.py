@@ -0,0 +1,264 @@
+# Copyright 2025 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Benchmark suite for the uw_msca parsing and request paths over synthetic
+fixtures, saving results to benchmarks/results/<label>.json so releases
+can be compared.
+
+    python -m benchmarks.suite [--rows 10k,1M,10M] [--case NAME ...]
+        [--repeat N] [--label LABEL] [--compare LABEL] [--no-save]
+
+--label defaults to the uw_msca version.
+"""
+
+import argparse
+import csv
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+from benchmarks.fixtures import (
+    StreamingResponse, delegate_csv_lines, drive_report_lines,
+    get_delegates_payload, write_drive_report)
+from uw_msca import DAO
+from uw_msca.delegate import (
+    _delegates_from_get_delegates, get_all_delegates, get_delegates,
+    iter_all_delegates)
+from uw_msca.models import (
+    Delegate, DelegateRecord, GoogleDriveState, GoogleDriveStateRecord)
+from uw_msca.shared_drive import get_google_drive_states
+
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+VERSION_FILE = os.path.join(
+    os.path.dirname(__file__), "..", "uw_msca", "VERSION")
+
+# mock DAO requests are file reads, so round trips are capped
+MAX_ROUND_TRIPS = 10000
+
+CASES = {}
+
+
+def case(name):
+    """
+    Register a benchmark.  The decorated function is given the fixture
+    size and does any setup, returning the number of items processed and
+    the function to time.
+    """
+    def decorator(func):
+        CASES[name] = func
+        return func
+    return decorator
+
+
+@case("GoogleDriveState.from_csv")
+def drive_state_from_csv(rows, tmp):
+    path = os.path.join(tmp, "report-{}.csv".format(rows))
+    if not os.path.exists(path):
+        write_drive_report(path, rows)
+
+    def run():
+        with open(path, newline="") as f:
+            for record in csv.DictReader(f):
+                GoogleDriveState.from_csv(record)
+
+    return rows, run
+
+
+def _drive_report(rows):
+    return "".join(drive_report_lines(rows)).encode("utf-8")
+
+
+@case("get_google_drive_states")
+def google_drive_states(rows, tmp):
+    response = StreamingResponse(_drive_report(rows))
+
+    def run():
+        with patch.object(DAO, "get_external_resource",
+                          return_value=response):
+            get_google_drive_states()
+
+    return rows, run
+
+
+@case("get_google_drive_states(GoogleDriveStateRecord)")
+def google_drive_state_records(rows, tmp):
+    response = StreamingResponse(_drive_report(rows))
+
+    def run():
+        with patch.object(DAO, "get_external_resource",
+                          return_value=response):
+            get_google_drive_states(record_class=GoogleDriveStateRecord)
+
+    return rows, run
+
+
+def _delegate_csv(rows):
+    return "".join(delegate_csv_lines(rows)).encode("utf-8")
+
+
+@case("get_all_delegates")
+def all_delegates(rows, tmp):
+    response = StreamingResponse(_delegate_csv(rows))
+
+    def run():
+        with patch.object(DAO, "get_external_resource",
+                          return_value=response):
+            get_all_delegates()
+
+    return rows, run
+
+
+@case("iter_all_delegates")
+def all_delegates_streamed(rows, tmp):
+    response = StreamingResponse(_delegate_csv(rows))
+
+    def run():
+        with patch.object(DAO, "get_external_resource",
+                          return_value=response):
+            for delegate in iter_all_delegates():
+                pass
+
+    return rows, run
+
+
+@case("Delegate.from_json")
+def delegate_from_json(rows, tmp):
+    delegates = json.loads(get_delegates_payload("javerage", rows))
+
+    def run():
+        for data in delegates["delegates"]:
+            Delegate().from_json("javerage", data)
+
+    return rows, run
+
+
+@case("GetDelegates payload")
+def get_delegates_response(rows, tmp):
+    payload = get_delegates_payload("javerage", rows)
+
+    def run():
+        _delegates_from_get_delegates("javerage", payload)
+
+    return rows, run
+
+
+@case("GetDelegates payload (DelegateRecord)")
+def get_delegates_records(rows, tmp):
+    payload = get_delegates_payload("javerage", rows)
+
+    def run():
+        _delegates_from_get_delegates("javerage", payload, DelegateRecord)
+
+    return rows, run
+
+
+@case("mock DAO get_delegates")
+def mock_dao_round_trip(rows, tmp):
+    calls = min(rows, MAX_ROUND_TRIPS)
+
+    def run():
+        for i in range(calls):
+            get_delegates("javerage")
+
+    return calls, run
+
+
+def parse_rows(value):
+    """
+    Parse a fixture size such as 10000, 10k or 1M
+    """
+    value = value.strip().lower()
+    for suffix, multiplier in (("k", 1000), ("m", 1000000)):
+        if value.endswith(suffix):
+            return int(float(value[:-1]) * multiplier)
+    return int(value)
+
+
+def run_suite(sizes, names, repeat):
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in sizes:
+            for name in names:
+                items, run = CASES[name](rows, tmp)
+                seconds = min(_timed(run) for i in range(repeat))
+                result = {"case": name, "rows": rows, "items": items,
+                          "seconds": round(seconds, 6)}
+                results.append(result)
+                print("{:<50} {:>9} rows {:10.3f}s {:>12.0f} items/s".format(
+                    name, rows, seconds, items / seconds), flush=True)
+
+    return results
+
+
+def _timed(run):
+    start = time.perf_counter()
+    run()
+    return time.perf_counter() - start
+
+
+def save_results(label, results):
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    path = os.path.join(RESULTS_DIR, "{}.json".format(label))
+    with open(path, "w") as f:
+        json.dump({
+            "label": label,
+            "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "results": results,
+        }, f, indent=2)
+        f.write("\n")
+    return path
+
+
+def compare_results(label, results):
+    """
+    Print each result's time relative to the saved results for label
+    """
+    with open(os.path.join(RESULTS_DIR, "{}.json".format(label))) as f:
+        baseline = {(r["case"], r["rows"]): r for r in json.load(f)["results"]}
+
+    print("\ncompared to {}:".format(label))
+    for result in results:
+        previous = baseline.get((result["case"], result["rows"]))
+        if previous is None:
+            continue
+        print("{:<50} {:>9} rows {:9.2f}x".format(
+            result["case"], result["rows"],
+            result["seconds"] / previous["seconds"]))
+
+
+def main(argv=None):
+    with open(VERSION_FILE) as f:
+        version = f.read().strip()
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", default="10k",
+                        help="comma separated fixture sizes, e.g. 10k,1M,10M")
+    parser.add_argument("--case", action="append", choices=list(CASES),
+                        help="benchmark to run, by default all")
+    parser.add_argument("--repeat", type=int, default=1,
+                        help="runs per benchmark, the fastest is kept")
+    parser.add_argument("--label", default=version)
+    parser.add_argument("--compare", help="label of results to compare to")
+    parser.add_argument("--no-save", action="store_true")
+    args = parser.parse_args(argv)
+
+    sizes = [parse_rows(rows) for rows in args.rows.split(",")]
+    results = run_suite(sizes, args.case or list(CASES), args.repeat)
+
+    if not args.no_save:
+        print("\nsaved {}".format(save_results(args.label, results)))
+    if args.compare:
+        compare_results(args.compare, results)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
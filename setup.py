@@ -19,12 +19,15 @@ os.chdir(os.path.normpath(os.path.join(os.path.abspath(__file__), os.pardir)))
 setup(
     name='UW-RestClients-MSCA',
     version=VERSION,
-    packages=['uw_msca'],
+    packages=['uw_msca', 'uw_msca.aio'],
     author="UW-IT AXDD",
     author_email="aca-it@uw.edu",
     include_package_data=True,
     install_requires=['UW-RestClients-Core~=1.3',
                       ],
+    extras_require={
+        'aio': ['aiohttp'],
+    },
     license='Apache License, Version 2.0',
     description=('A library for connecting to the UW NetID API'),
     long_description=README,
@@ -6,13 +6,20 @@ This is the interface for interacting with
 the uwnetid subscription web service.
 """
 
+import codecs
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 from commonconf import settings
 from restclients_core.exceptions import DataFailureException
+from uw_msca import metrics, retry
 from uw_msca.dao import MSCA_DAO
+from uw_msca.singleflight import SingleFlight
 
 
 DAO = MSCA_DAO()
+IN_FLIGHT_GETS = SingleFlight()
+STREAM_CHUNK_SIZE = 64 * 1024
 logger = logging.getLogger(__name__)
 
 
@@ -28,7 +35,17 @@ def get_resource(url, headers=None):
     if headers:
         default_headers.update(headers)
 
-    response = DAO.getURL(url, default_headers)
+    if getattr(settings, 'RESTCLIENTS_MSCA_COALESCE_GETS', True):
+        # concurrent GETs of the same url share one upstream request
+        return IN_FLIGHT_GETS.do(
+            (url, tuple(sorted(default_headers.items()))),
+            lambda: _get_resource(url, default_headers))
+
+    return _get_resource(url, default_headers)
+
+
+def _get_resource(url, headers):
+    response = _dao_request("GET", url, DAO.getURL, headers)
     logger.debug("GET {0} ==status==> {1}".format(url, response.status))
     if response.status != 200:
         raise DataFailureException(url, response.status, response.data)
@@ -39,7 +56,7 @@ def get_resource(url, headers=None):
 
 
 def post_resource(url, body):
-    response = DAO.postURL(url, {
+    response = _dao_request("POST", url, DAO.postURL, {
         'Content-Type': 'application/json',
         'Acept': 'application/json',
     }, body)
@@ -61,8 +78,10 @@ def put_resource(url, body, headers=None):
     if headers:
         default_headers.update(headers)
 
-    response = DAO.putURL(
+    response = _dao_request(
+        "PUT",
         url,
+        DAO.putURL,
         default_headers,
         body,
     )
@@ -77,7 +96,7 @@ def put_resource(url, body, headers=None):
 
 
 def patch_resource(url, body):
-    response = DAO.patchURL(url, {
+    response = _dao_request("PATCH", url, DAO.patchURL, {
         'Content-Type': 'application/json',
         'Acept': 'application/json',
     }, body)
@@ -92,7 +111,8 @@ def patch_resource(url, body):
 
 
 def get_external_resource(url, body=None):
-    response = DAO.get_external_resource(url, body=body)
+    response = _dao_request(
+        "GET", url, DAO.get_external_resource, body=body)
 
     logger.debug(
         "external_resource {0} ==status==> {1}".format(url, response.status))
@@ -104,3 +124,112 @@ def get_external_resource(url, body=None):
         "external_resource {0}s ==data==> {1}".format(url, response.data))
 
     return response.data
+
+
+def stream_external_resource(url, chunk_size=STREAM_CHUNK_SIZE):
+    """
+    Yield the body of an external resource in chunks of bytes rather
+    than reading the whole body into memory
+    """
+    started = time.perf_counter()
+    try:
+        response, retries = retry.send(
+            "GET", url, DAO.get_external_resource, preload_content=False)
+    except Exception as ex:
+        metrics.record("GET", url, getattr(ex, "status", 0),
+                       time.perf_counter() - started)
+        raise
+
+    logger.debug(
+        "external_resource {0} ==status==> {1}".format(url, response.status))
+
+    received = 0
+    try:
+        if response.status != 200:
+            raise DataFailureException(url, response.status, response.data)
+
+        if hasattr(response, "stream"):
+            for chunk in response.stream(chunk_size):
+                received += len(chunk)
+                yield chunk
+        else:
+            # mock responses arrive fully loaded
+            received = len(response.data)
+            yield response.data
+    finally:
+        if hasattr(response, "release_conn"):
+            response.release_conn()
+        metrics.record("GET", url, response.status,
+                       time.perf_counter() - started, received,
+                       retries + metrics.response_retries(response))
+
+
+def _dao_request(method, url, load, *args, **kwargs):
+    """
+    Return the response of DAO method load, retrying failures and
+    recording request metrics
+    """
+    started = time.perf_counter()
+    try:
+        response, retries = retry.send(method, url, load, *args, **kwargs)
+    except Exception as ex:
+        metrics.record(method, url, getattr(ex, "status", 0),
+                       time.perf_counter() - started)
+        raise
+
+    metrics.record(method, url, response.status,
+                   time.perf_counter() - started,
+                   len(response.data or b""),
+                   retries + metrics.response_retries(response))
+    return response
+
+
+def iter_decoded_lines(chunks, encoding="utf-8"):
+    """
+    Decode an iterable of byte chunks and yield it line by line,
+    line endings included, such that it can be handed to a csv.reader
+    """
+    decoder = codecs.getincrementaldecoder(encoding)()
+    pending = ""
+    for chunk in chunks:
+        pending += decoder.decode(chunk)
+        lines = pending.split("\n")
+        pending = lines.pop()
+        for line in lines:
+            yield line + "\n"
+
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+
+def map_concurrently(func, keys, max_workers=None):
+    """
+    Call func for each of the distinct keys over a bounded thread pool.
+
+    Returns a tuple of dicts, key to result for the calls that returned and
+    key to exception for those that raised, so one failure does not abort
+    the batch.  max_workers defaults to RESTCLIENTS_MSCA_MAX_WORKERS, which
+    should not exceed the DAO connection pool size.
+    """
+    if max_workers is None:
+        max_workers = int(
+            getattr(settings, 'RESTCLIENTS_MSCA_MAX_WORKERS', 10))
+
+    keys = list(dict.fromkeys(keys))
+    results = {}
+    errors = {}
+    if not keys:
+        return results, errors
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [(key, executor.submit(func, key)) for key in keys]
+        for key, future in futures:
+            try:
+                results[key] = future.result()
+            except Exception as ex:
+                logger.error("{0}({1}) failed: {2}".format(
+                    getattr(func, '__name__', func), key, ex))
+                errors[key] = ex
+
+    return results, errors
@@ -6,21 +6,28 @@ Interface for interacting with UW MSCA outlook API
 """
 
 import logging
-import json
 from uw_msca.models import AccessRight
 from uw_msca import url_base, get_resource
+from uw_msca.fastjson import loads
+from uw_msca.cache import cached_lookup
 
 
 logger = logging.getLogger(__name__)
 
 
-def get_access_rights():
+@cached_lookup('RESTCLIENTS_MSCA_LOOKUP_CACHE_TTL')
+def get_access_rights(record_class=AccessRight):
     """
-    Returns list of Outlook mailbox Access Rights
+    Returns list of Outlook mailbox Access Rights, cached for
+    RESTCLIENTS_MSCA_LOOKUP_CACHE_TTL seconds
+
+    Args:
+        record_class: AccessRight, or AccessRightRecord for a lightweight
+            representation
     """
     url = _msca_access_rights_url()
     response = get_resource(url)
-    return _json_to_supported(response)
+    return _json_to_supported(response, record_class)
 
 
 def _msca_access_rights_url():
@@ -30,14 +37,10 @@ def _msca_access_rights_url():
     return "{}/GetAccessRights".format(url_base())
 
 
-def _json_to_supported(response_body):
+def _json_to_supported(response_body, record_class=AccessRight):
     """
     Returns a list of Supported objects
     """
-    data = json.loads(response_body)
-    access_rights = []
-
-    for access_right in data.get('value'):
-        access_rights.append(AccessRight().from_json(access_right))
-
-    return access_rights
+    data = loads(response_body)
+    return [record_class().from_json(access_right)
+            for access_right in data.get('value')]
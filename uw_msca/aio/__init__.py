@@ -0,0 +1,241 @@
+# Copyright 2025 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+asyncio interface for interacting with the MSCA API.
+
+Mirrors the uw_msca interface with coroutines.  Live requests are made
+with aiohttp (pip install UW-RestClients-MSCA[aio]) over a connection pool
+per event loop when the RESTCLIENTS_MSCA_DAO_CLASS implementation is
+live, including the legacy restclients.dao_implementation.msca.Live.
+Otherwise responses are loaded from the implementation, e.g., the
+resources/msca/file mock fixtures.
+"""
+
+import asyncio
+import logging
+import ssl
+import time
+import weakref
+from urllib.parse import urlparse
+from restclients_core.exceptions import (
+    DataFailureException, ImproperlyConfigured)
+from restclients_core.models import MockHTTP
+from uw_msca import DAO, metrics, retry
+
+
+logger = logging.getLogger(__name__)
+
+_transports = weakref.WeakKeyDictionary()
+
+
+class MockTransport:
+    """
+    Serves responses loaded from a non-live MSCA_DAO implementation, by
+    default the Mock implementation's resource fixtures
+    """
+    def __init__(self, dao, implementation=None):
+        self.dao = dao
+        self.implementation = (
+            implementation or dao._get_mock_implementation())
+
+    async def request(self, method, url, headers, body=None):
+        return self.implementation.load(method, url, headers, body)
+
+    async def external_request(self, url, body=None):
+        response = MockHTTP()
+        response.status = 404
+        response.data = b""
+        return response
+
+    async def close(self):
+        pass
+
+
+class LiveTransport:
+    """
+    Makes requests with an aiohttp ClientSession sized, and MSCA requests
+    verified and authenticated, by the same RESTCLIENTS_MSCA_* settings as
+    the restclients_core LiveDAO
+    """
+    def __init__(self, dao):
+        try:
+            import aiohttp
+        except ImportError:
+            raise ImproperlyConfigured(
+                "uw_msca.aio requires aiohttp for Live requests")
+
+        self.dao = dao
+        self.host = dao.get_service_setting("HOST")
+        self.ssl = _ssl_context(dao)
+        self.session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=int(dao.get_service_setting("POOL_SIZE", 10))),
+            timeout=aiohttp.ClientTimeout(
+                sock_connect=float(dao.get_service_setting(
+                    "CONNECT_TIMEOUT", 3)),
+                sock_read=float(dao.get_service_setting("TIMEOUT", 10))))
+
+    async def request(self, method, url, headers, body=None):
+        headers = dict(headers)
+        headers.update(self.dao._custom_headers(method, url, headers, body))
+        kwargs = {} if self.ssl is None else {"ssl": self.ssl}
+        return await self._request(
+            method, self.host + url, headers, body, **kwargs)
+
+    async def external_request(self, url, body=None):
+        return await self._request("GET", url, {}, body)
+
+    async def _request(self, method, url, headers, body, **kwargs):
+        import aiohttp
+
+        try:
+            async with self.session.request(
+                    method, url, headers=headers, data=body,
+                    **kwargs) as resp:
+                response = MockHTTP()
+                response.status = resp.status
+                response.headers = dict(resp.headers)
+                response.data = await resp.read()
+                return response
+        except (aiohttp.ClientError, asyncio.TimeoutError) as ex:
+            raise DataFailureException(url, 0, ex)
+
+    async def close(self):
+        await self.session.close()
+
+
+def get_transport():
+    """
+    Return the transport for the running event loop
+    """
+    loop = asyncio.get_running_loop()
+    transport = _transports.get(loop)
+    if transport is None:
+        implementation = DAO.get_implementation()
+        if implementation.is_live():
+            transport = LiveTransport(DAO)
+        else:
+            transport = MockTransport(DAO, implementation)
+        _transports[loop] = transport
+
+    return transport
+
+
+def _ssl_context(dao):
+    """
+    Return the SSLContext LiveDAO's pool would verify and authenticate
+    MSCA requests with, or None if HOST isn't https
+    """
+    if urlparse(dao.get_service_setting("HOST") or "").scheme != "https":
+        return None
+
+    context = dao.get_service_setting("SSL_CONTEXT")
+    if context is not None:
+        return context
+
+    verify_https = dao.get_service_setting("VERIFY_HTTPS")
+    if verify_https is None or verify_https:
+        context = ssl.create_default_context(cafile=dao.get_setting(
+            "CA_BUNDLE", "/etc/ssl/certs/ca-bundle.crt"))
+    else:
+        context = ssl.create_default_context()
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+
+    cert_file = dao.get_service_setting("CERT_FILE", None)
+    key_file = dao.get_service_setting("KEY_FILE", None)
+    if cert_file is not None and key_file is not None:
+        context.load_cert_chain(cert_file, key_file)
+
+    return context
+
+
+async def close_transport():
+    """
+    Close the running event loop's transport and its pooled connections
+    """
+    transport = _transports.pop(asyncio.get_running_loop(), None)
+    if transport is not None:
+        await transport.close()
+
+
+async def _request(method, url, request):
+    """
+    Return the response of the transport request coroutine request()
+    returns, retrying failures and recording request metrics
+    """
+    started = time.perf_counter()
+    try:
+        response, retries = await retry.send_async(method, url, request)
+    except Exception as ex:
+        metrics.record(method, url, getattr(ex, "status", 0),
+                       time.perf_counter() - started)
+        raise
+
+    metrics.record(method, url, response.status,
+                   time.perf_counter() - started, len(response.data or b""),
+                   retries)
+    return response
+
+
+async def _load(method, url, headers, body=None):
+    transport = get_transport()
+    response = await _request(method, url, lambda: transport.request(
+        method, url, headers, body))
+    logger.debug("{0} {1} ==status==> {2}".format(
+        method, url, response.status))
+
+    if response.status != 200:
+        raise DataFailureException(url, response.status, response.data)
+
+    logger.debug("{0} {1} ==data==> {2}".format(method, url, response.data))
+
+    return response.data
+
+
+async def get_resource(url, headers=None):
+    default_headers = {"Accept": "application/json"}
+    if headers:
+        default_headers.update(headers)
+
+    return await _load("GET", url, default_headers)
+
+
+async def post_resource(url, body):
+    return await _load("POST", url, {
+        'Content-Type': 'application/json',
+        'Accept': 'application/json',
+    }, body)
+
+
+async def put_resource(url, body, headers=None):
+    default_headers = {
+        "Accept": "application/json",
+        "Content-Type": "application/json",
+    }
+    if headers:
+        default_headers.update(headers)
+
+    return await _load("PUT", url, default_headers, body)
+
+
+async def patch_resource(url, body):
+    return await _load("PATCH", url, {
+        'Content-Type': 'application/json',
+        'Accept': 'application/json',
+    }, body)
+
+
+async def get_external_resource(url, body=None):
+    transport = get_transport()
+    response = await _request(
+        "GET", url, lambda: transport.external_request(url, body=body))
+
+    logger.debug(
+        "external_resource {0} ==status==> {1}".format(url, response.status))
+
+    if response.status != 200:
+        raise DataFailureException(url, response.status, response.data)
+
+    return response.data
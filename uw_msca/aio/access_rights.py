@@ -0,0 +1,24 @@
+# Copyright 2025 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+asyncio interface for interacting with UW MSCA outlook API
+"""
+
+from uw_msca.aio import get_resource
+from uw_msca.models import AccessRight
+from uw_msca.access_rights import (
+    _msca_access_rights_url, _json_to_supported,
+    get_access_rights as _get_access_rights)
+from uw_msca.cache import cached_async_lookup
+
+
+@cached_async_lookup(_get_access_rights)
+async def get_access_rights(record_class=AccessRight):
+    """
+    Returns list of Outlook mailbox Access Rights, cached with the
+    synchronous get_access_rights for RESTCLIENTS_MSCA_LOOKUP_CACHE_TTL
+    seconds
+    """
+    response = await get_resource(_msca_access_rights_url())
+    return _json_to_supported(response, record_class)
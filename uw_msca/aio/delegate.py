@@ -0,0 +1,115 @@
+# Copyright 2025 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+asyncio interface for interacting with the UW MSCA outlook API
+"""
+
+import asyncio
+from uw_msca.aio import get_resource, post_resource, patch_resource
+from uw_msca.models import Delegate
+from uw_msca.delegate import (
+    _msca_get_delegate_url, _msca_set_delegate_url,
+    _msca_update_delegate_url, _msca_remove_delegate_url,
+    _delegate_perms_body, _update_delegate_perms_body,
+    _delegates_from_get_delegates, _delegates_from_perms_response,
+    _cached_delegates, _delegate_generation, _invalidate_delegates)
+
+
+async def get_delegates(netid, record_class=Delegate):
+    """
+    Returns delegate list for given netid
+    """
+    delegates = _cached_delegates(netid, record_class)
+    if delegates is not None:
+        return delegates
+
+    generation = _delegate_generation(netid)
+    response = await get_resource(_msca_get_delegate_url(netid))
+    return _delegates_from_get_delegates(
+        netid, response, record_class, generation)
+
+
+async def get_delegates_bulk(netids, max_concurrency=10,
+                             record_class=Delegate):
+    """
+    Returns delegate lists for many netids, fetched concurrently.
+
+    Returns a tuple of dicts: netid to delegate list, and netid to the
+    exception raised fetching it.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def fetch(netid):
+        async with semaphore:
+            return await get_delegates(netid, record_class)
+
+    netids = list(dict.fromkeys(netids))
+    responses = await asyncio.gather(
+        *[fetch(netid) for netid in netids], return_exceptions=True)
+
+    results = {}
+    errors = {}
+    for netid, response in zip(netids, responses):
+        if isinstance(response, Exception):
+            errors[netid] = response
+        else:
+            results[netid] = response
+
+    return results, errors
+
+
+async def set_delegate(netid, delegate, access_type, record_class=Delegate):
+    """
+    Returns with delegate access set for netid resource
+    """
+    return await _write_delegates(
+        netid, "set_delegate", post_resource(
+            _msca_set_delegate_url(netid, delegate, access_type),
+            _delegate_perms_body(netid, delegate, access_type)),
+        record_class)
+
+
+async def update_delegate(netid, delegate, old_access_type, new_access_type,
+                          record_class=Delegate):
+    """
+    Returns with delegate access set for netid resource
+    """
+    return await _write_delegates(
+        netid, "set_delegate", patch_resource(
+            _msca_update_delegate_url(
+                netid, delegate, old_access_type, new_access_type),
+            _update_delegate_perms_body(
+                netid, delegate, old_access_type, new_access_type)),
+        record_class)
+
+
+async def remove_delegate(netid, delegate, access_type,
+                          record_class=Delegate):
+    """
+    Returns with delegate access removed from netid resource
+    """
+    return await _write_delegates(
+        netid, "remove_delegate", post_resource(
+            _msca_remove_delegate_url(netid, delegate, access_type),
+            _delegate_perms_body(netid, delegate, access_type)),
+        record_class)
+
+
+async def _write_delegates(netid, operation, request, record_class):
+    """
+    Returns delegate list from the response of coroutine request, keeping
+    netid's cached delegates coherent with the write
+    """
+    _invalidate_delegates(netid)
+    try:
+        response = await request
+    except BaseException:
+        # the write may have been applied regardless
+        _invalidate_delegates(netid)
+        raise
+
+    # discard any GET sent before the write was answered
+    generation = _invalidate_delegates(netid)
+    return _delegates_from_perms_response(
+        response, operation, record_class, netid, generation)
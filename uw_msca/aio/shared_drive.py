@@ -0,0 +1,57 @@
+# Copyright 2025 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+asyncio interface for MSCA's /google/vN/drive endpoints.
+"""
+
+import io
+import json
+from uw_msca.aio import get_resource, get_external_resource, put_resource
+from uw_msca.models import GoogleDriveState, Quota
+from uw_msca.shared_drive import (
+    _decode_drive_state_rows, _drive_state_rows,
+    _get_default_org_unit_url, _get_drivestate_url, _set_quota_url,
+    _set_quota_response, get_default_org_unit as _get_default_org_unit)
+from uw_msca.cache import cached_async_lookup
+
+
+@cached_async_lookup(_get_default_org_unit)
+async def get_default_org_unit():
+    """
+    Return the default/subsidized Org Unit for Shared Drives, cached with
+    the synchronous get_default_org_unit for
+    RESTCLIENTS_MSCA_LOOKUP_CACHE_TTL seconds.
+    """
+    org_unit_resp = await get_resource(url=_get_default_org_unit_url())
+    return json.loads(org_unit_resp)["ou"]
+
+
+async def get_default_quota():
+    return Quota.to_int(await get_default_org_unit())
+
+
+async def get_google_drive_states(record_class=GoogleDriveState):
+    """
+    Return list of GoogleDriveState's from report generated by PPLAT.
+    """
+    drive_state_reports_resp = await get_resource(url=_get_drivestate_url())
+    drive_state_reports_url = json.loads(drive_state_reports_resp)["sasKey"]
+    report_resp = await get_external_resource(drive_state_reports_url)
+
+    lines = io.StringIO(report_resp.decode("utf-8"), newline="")
+    return list(_decode_drive_state_rows(
+        _drive_state_rows(lines), record_class))
+
+
+async def set_drive_quota(quota: int, drive_id: str):
+    """
+    Update Google Drive to have the specified quota.
+
+    Args:
+        quota: integer quota in units of GB. 100 == 100GB
+    """
+    resp_data = await put_resource(
+        url=_set_quota_url(drive_id),
+        body=json.dumps({"quota": Quota.to_str(quota)}))
+    return _set_quota_response(resp_data)
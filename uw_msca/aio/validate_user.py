@@ -0,0 +1,22 @@
+# Copyright 2025 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+asyncio interface for interacting with the UW MSCA outlook API
+"""
+
+from uw_msca.aio import get_resource
+from uw_msca.validate_user import (
+    _msca_validate_user_url, _cached_validated_user, _validated_user)
+
+
+async def validate_user(name):
+    """
+    Returns whether or not given user has access to Outlook mailbox
+    """
+    validated = _cached_validated_user(name)
+    if validated is not None:
+        return validated
+
+    response = await get_resource(_msca_validate_user_url(name))
+    return _validated_user(name, response)
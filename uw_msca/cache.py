@@ -0,0 +1,146 @@
+# Copyright 2025 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+In-process caching for MSCA reference data.
+"""
+
+import threading
+import time
+from functools import wraps
+from commonconf import settings
+
+
+CACHES = {}
+
+
+class TTLCache:
+    """
+    Thread-safe dict of values that expire ttl seconds after being set,
+    counting hits and misses.
+    """
+    def __init__(self, name, ttl=300):
+        self.name = name
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data = {}
+        self._lock = threading.Lock()
+        CACHES[name] = self
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                expires, value = self._data[key]
+                if expires > time.monotonic():
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            except KeyError:
+                pass
+
+            self.misses += 1
+            return default
+
+    def set(self, key, value, ttl=None):
+        ttl = self.ttl if ttl is None else ttl
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+
+    def invalidate(self, key=None):
+        """
+        Remove key from the cache, or everything if key is None
+        """
+        with self._lock:
+            if key is None:
+                self._data.clear()
+            else:
+                self._data.pop(key, None)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._data),
+            }
+
+
+def cached_lookup(ttl_setting, default_ttl=300):
+    """
+    Decorator caching a function's result per arguments for the number of
+    seconds given by the ttl_setting setting.  A ttl of 0 disables
+    caching.
+
+    The cache is available as the wrapped function's cache attribute.
+    """
+    def decorator(func):
+        cache = TTLCache("{}.{}".format(func.__module__, func.__name__))
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            ttl = _lookup_ttl(ttl_setting, default_ttl)
+            if ttl <= 0:
+                return func(*args, **kwargs)
+
+            key = _lookup_key(args, kwargs)
+            value = cache.get(key, _missing)
+            if value is _missing:
+                value = func(*args, **kwargs)
+                cache.set(key, value, ttl=ttl)
+
+            return value
+
+        wrapper.cache = cache
+        wrapper.ttl_setting = ttl_setting
+        wrapper.default_ttl = default_ttl
+        return wrapper
+
+    return decorator
+
+
+def cached_async_lookup(cached):
+    """
+    Decorator caching a coroutine function's result in the cache of
+    cached, the cached_lookup decorated function it is the asyncio
+    counterpart of, so they share results and TTL.
+    """
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            ttl = _lookup_ttl(cached.ttl_setting, cached.default_ttl)
+            if ttl <= 0:
+                return await func(*args, **kwargs)
+
+            key = _lookup_key(args, kwargs)
+            value = cached.cache.get(key, _missing)
+            if value is _missing:
+                value = await func(*args, **kwargs)
+                cached.cache.set(key, value, ttl=ttl)
+
+            return value
+
+        wrapper.cache = cached.cache
+        return wrapper
+
+    return decorator
+
+
+_missing = object()
+
+
+def _lookup_ttl(ttl_setting, default_ttl):
+    return int(getattr(settings, ttl_setting, default_ttl))
+
+
+def _lookup_key(args, kwargs):
+    return args + tuple(sorted(kwargs.items())) if kwargs else args
+
+
+def invalidate_caches():
+    for cache in CACHES.values():
+        cache.invalidate()
+
+
+def cache_stats():
+    return {name: cache.stats() for (name, cache) in CACHES.items()}
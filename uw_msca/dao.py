@@ -2,13 +2,21 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import os
+import threading
 from urllib3 import PoolManager
+from urllib3.util import Timeout
 from urllib3.util.retry import Retry
 from os.path import abspath, dirname
 from restclients_core.dao import DAO
+from restclients_core.models import MockHTTP
+from uw_msca.download import RangedDownloader
 
 
 class MSCA_DAO(DAO):
+    # shared by all instances, see external_pool_manager()
+    _external_pool = None
+    _external_pool_lock = threading.Lock()
+
     def service_name(self):
         return 'msca'
 
@@ -22,7 +30,102 @@ class MSCA_DAO(DAO):
     def getURL(self, url, headers={}, body=None):
         return self._load_resource("GET", url, headers, body)
 
-    def get_external_resource(self, url, body=None):
-        http = PoolManager(
-            retries=Retry(total=1, connect=0, read=0, redirect=1))
-        return http.request('GET', url, body=body)
+    def get_external_resource(self, url, body=None, preload_content=True):
+        range_size = self.get_service_setting("EXTERNAL_RANGE_SIZE", 0)
+        if range_size and preload_content and body is None:
+            return self.download_external_resource(url, int(range_size))
+
+        return self.external_pool_manager().request(
+            'GET', url, body=body, preload_content=preload_content)
+
+    def download_external_resource(self, url, range_size, parallel=None):
+        """
+        Download url in range_size byte Range requests, resuming ranges
+        that fail part way.  Ranges are fetched parallel at a time,
+        defaulting to RESTCLIENTS_MSCA_EXTERNAL_RANGE_PARALLEL.
+        """
+        if parallel is None:
+            parallel = self.get_service_setting("EXTERNAL_RANGE_PARALLEL", 1)
+
+        downloader = RangedDownloader(
+            self.external_pool_manager(), chunk_size=range_size,
+            parallel=int(parallel), attempts=int(self.get_service_setting(
+                "EXTERNAL_RANGE_ATTEMPTS", 5)))
+
+        response = MockHTTP()
+        response.status = 200
+        response.data = downloader.download(url)
+        return response
+
+    def external_pool_manager(self):
+        """
+        Return the PoolManager shared by external resource requests,
+        e.g., report downloads from blob storage, so connections to
+        those hosts are kept alive and reused across calls.
+        """
+        with MSCA_DAO._external_pool_lock:
+            if MSCA_DAO._external_pool is None:
+                MSCA_DAO._external_pool = self._create_external_pool()
+            return MSCA_DAO._external_pool
+
+    def _create_external_pool(self):
+        headers = None
+        keep_alive = self.get_service_setting("EXTERNAL_KEEP_ALIVE", True)
+        if str(keep_alive).lower() in ("false", "0", "no"):
+            headers = {"Connection": "close"}
+
+        return PoolManager(
+            num_pools=int(self.get_service_setting("EXTERNAL_NUM_POOLS", 10)),
+            maxsize=int(self.get_service_setting("EXTERNAL_POOL_SIZE", 10)),
+            block=False,
+            headers=headers,
+            timeout=Timeout(
+                connect=float(self.get_service_setting(
+                    "EXTERNAL_CONNECT_TIMEOUT", 3)),
+                read=float(self.get_service_setting(
+                    "EXTERNAL_TIMEOUT", 60))),
+            retries=Retry(
+                total=int(self.get_service_setting("EXTERNAL_RETRIES", 1)),
+                connect=int(self.get_service_setting(
+                    "EXTERNAL_CONNECT_RETRIES", 0)),
+                read=int(self.get_service_setting(
+                    "EXTERNAL_READ_RETRIES", 0)),
+                redirect=1,
+                backoff_factor=float(self.get_service_setting(
+                    "EXTERNAL_BACKOFF_FACTOR", 0))))
+
+    def external_pool_stats(self):
+        """
+        Return per-host connection reuse counts for external resources
+        """
+        stats = {}
+        with MSCA_DAO._external_pool_lock:
+            pools = MSCA_DAO._external_pool.pools if (
+                MSCA_DAO._external_pool) else None
+            for key in (pools.keys() if pools else []):
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+
+                host = "{}://{}:{}".format(
+                    pool.scheme, pool.host, pool.port)
+                requests = pool.num_requests
+                connections = pool.num_connections
+                stats[host] = {
+                    "requests": requests,
+                    "connections": connections,
+                    "reused": max(requests - connections, 0),
+                }
+
+        return stats
+
+    @classmethod
+    def reset_external_pool(cls):
+        """
+        Close pooled external connections, the pool is recreated from
+        settings on next use
+        """
+        with cls._external_pool_lock:
+            if cls._external_pool is not None:
+                cls._external_pool.clear()
+            cls._external_pool = None
@@ -5,15 +5,36 @@
 Interface for interacting with the UW MSCA outlook API
 """
 
-from uw_msca.models import Delegate
+from uw_msca.models import Delegate, DelegateIndex
 from uw_msca import (url_base, get_resource, post_resource,
-                     patch_resource, get_external_resource)
+                     patch_resource, get_external_resource, map_concurrently,
+                     stream_external_resource, iter_decoded_lines)
+from uw_msca.cache import TTLCache
+from uw_msca.fastjson import loads
+from commonconf import settings
+from functools import wraps
+import csv
 import json
 import logging
+import threading
 
 
 logger = logging.getLogger(__name__)
 
+# delegate csv column names, mailbox column as observed in GetDelegates
+DELEGATE_CSV_MAILBOX_FIELDS = ("Identity", "netid", "Mailbox", "TargetNetid")
+DELEGATE_CSV_USER_FIELD = "User"
+DELEGATE_CSV_ACCESS_RIGHTS_FIELD = "AccessRights"
+
+# mailbox netid to (delegate, access right) tuples, from GetDelegates and
+# the delegate lists returned by Set/Update/RemoveDelegatePerms
+DELEGATE_CACHE = TTLCache("uw_msca.delegate.delegates")
+
+# mailbox netid to a count of the delegate writes begun on it, such that a
+# response to a request sent before a write isn't cached after it
+_delegate_generations = {}
+_delegate_generations_lock = threading.Lock()
+
 
 def _delegate_url_base(netid):
     """
@@ -60,31 +81,135 @@ def _msca_remove_delegate_url(netid, delegate, access_type):
         _delegate_url_base(netid), delegate, access_type)
 
 
-def get_delegates(netid):
+def get_delegates(netid, record_class=Delegate):
     """
     Returns delegate list for given netid, mind payload changes
+
+    Args:
+        record_class: Delegate, or DelegateRecord for a lightweight
+            representation suited to mailboxes with many delegates
     """
+    delegates = _cached_delegates(netid, record_class)
+    if delegates is not None:
+        return delegates
+
+    generation = _delegate_generation(netid)
     url = _msca_get_delegate_url(netid)
     response = get_resource(url)
+    return _delegates_from_get_delegates(
+        netid, response, record_class, generation)
+
+
+def _delegate_cache_ttl():
+    return int(getattr(settings, 'RESTCLIENTS_MSCA_DELEGATE_CACHE_TTL', 0))
+
+
+def _cached_delegates(netid, record_class=Delegate):
+    """
+    Returns netid's cached delegate list, or None
+    """
+    if _delegate_cache_ttl() <= 0:
+        return None
+
+    delegates = DELEGATE_CACHE.get(netid)
+    return (None if delegates is None
+            else _build_delegates(netid, delegates, record_class))
+
+
+def _cache_delegates(netid, delegates, generation):
+    """
+    Caches netid's (delegate, access right) tuples for
+    RESTCLIENTS_MSCA_DELEGATE_CACHE_TTL seconds, 0 (the default)
+    disabling the cache, unless a delegate write on netid has begun since
+    _delegate_generation returned generation
+    """
+    ttl = _delegate_cache_ttl()
+    if ttl <= 0:
+        return
+
+    with _delegate_generations_lock:
+        if _delegate_generations.get(netid, 0) == generation:
+            DELEGATE_CACHE.set(netid, tuple(delegates), ttl=ttl)
+
+
+def _delegate_generation(netid):
+    with _delegate_generations_lock:
+        return _delegate_generations.get(netid, 0)
+
+
+def _invalidate_delegates(netid):
+    """
+    Removes netid's cached delegates and keeps responses to requests
+    already sent from being cached, returning the new generation
+    """
+    with _delegate_generations_lock:
+        generation = _delegate_generations.get(netid, 0) + 1
+        _delegate_generations[netid] = generation
+        DELEGATE_CACHE.invalidate(netid)
+        return generation
+
+
+def _parse_delegates(response):
+    """
+    Returns the mailbox netid and its list of (delegate, access right)
+    tuples from a GetDelegates or Set/Update/RemoveDelegatePerms response
+    body
+    """
+    data = loads(response)
+    if isinstance(data, list) and len(data) == 1:
+        data = data[0]
+    elif not isinstance(data, dict):
+        raise Exception(f"unexpected data: {data}")
+
+    if 'TargetNetid' in data:
+        mailbox, delegates = data['TargetNetid'], data['Delegates']
+    else:
+        mailbox, delegates = data['netid'], data['delegates']
+
+    return mailbox, [(d['User'], d['AccessRights']) for d in delegates]
+
+
+def _build_delegates(mailbox, delegates, record_class=Delegate):
+    return [record_class(user=mailbox, delegate=delegate,
+                         access_right=access_right)
+            for (delegate, access_right) in delegates]
+
+
+def _delegates_from_get_delegates(netid, response, record_class=Delegate,
+                                  generation=None):
+    """
+    Returns delegate list from a GetDelegates response body, caching it
+    if generation, netid's generation when the request was sent, is given
+    """
     try:
-        data = json.loads(response)
-        if isinstance(data, list) and len(data) == 1:
-            data = data[0]
-        elif not isinstance(data, dict):
-            raise Exception("unexpected data: {data}")
-
-        mailbox = data['netid']
-        delegates = data['delegates']
+        mailbox, delegates = _parse_delegates(response)
         if netid == mailbox:
-            return [Delegate().from_json(mailbox, d) for d in delegates]
+            if generation is not None:
+                _cache_delegates(netid, delegates, generation)
+            return _build_delegates(mailbox, delegates, record_class)
 
         logger.error(f"get_delegates: netid mismatch: {netid} != {mailbox}")
-    except (KeyError, json.JSONDecodeError) as ex:
+    except (KeyError, TypeError, json.JSONDecodeError) as ex:
         logger.error(f"get_delegates: malformed response: {response}")
 
     return []
 
 
+def get_delegates_bulk(netids, max_workers=None, record_class=Delegate):
+    """
+    Returns delegate lists for many netids, fetched concurrently.
+
+    Returns a tuple of dicts: netid to delegate list, and netid to the
+    exception raised fetching it.
+    """
+    @wraps(get_delegates)
+    def get_netid_delegates(netid):
+        return get_delegates(netid, record_class)
+
+    return map_concurrently(
+        get_netid_delegates, netids, max_workers=max_workers)
+
+
 def get_all_delegates():
     """
     method returns all delegations assigned in outlook via
@@ -98,81 +223,142 @@ def get_all_delegates():
     return response.decode('utf-8').split('\r\n')
 
 
-def set_delegate(netid, delegate, access_type):
+def iter_all_delegates():
     """
-    Returns with delegate access set for netid resource
+    Yield a Delegate for each delegation in the all delegate csv, streamed
+    from the url returned by GetDelegateCsv rather than loaded whole.
     """
-    url = _msca_set_delegate_url(netid, delegate, access_type)
-    body = json.dumps({
-        'netid': netid,
-        'delegate': delegate,
-        'accesstype': access_type
-    })
+    delegates_csv_url = _msca_get_all_delegates_csv_url()
+    csv_url = get_resource(delegates_csv_url).decode('utf-8').strip()
+    rows = csv.reader(iter_decoded_lines(stream_external_resource(csv_url)))
+
+    # mailbox, delegate, access right columns when there is no header row
+    columns = (0, 1, 2)
+    for row in rows:
+        if not row:
+            continue
+
+        if DELEGATE_CSV_USER_FIELD in row:
+            columns = _delegate_csv_columns(row)
+            continue
+
+        try:
+            yield Delegate(user=row[columns[0]],
+                           delegate=row[columns[1]],
+                           access_right=row[columns[2]])
+        except IndexError:
+            logger.error(f"iter_all_delegates: malformed row: {row}")
+
+
+def get_all_delegates_index():
+    """
+    Returns a DelegateIndex of all delegations assigned in outlook
+    """
+    return DelegateIndex(iter_all_delegates())
 
-    response = post_resource(url, body)
 
-    delegates = []
+def _delegate_csv_columns(header):
+    mailbox = next((header.index(f) for f in DELEGATE_CSV_MAILBOX_FIELDS
+                    if f in header), 0)
     try:
-        json_response = json.loads(response)
-        user = json_response['TargetNetid']
-        for delegate in json_response['Delegates']:
-            delegates.append(Delegate().from_json(user, delegate))
-    except Exception as ex:
-        logger.error("set_delegate response: -->{}<-- error: {}".format(
-            response, ex))
+        access_rights = header.index(DELEGATE_CSV_ACCESS_RIGHTS_FIELD)
+    except ValueError:
+        access_rights = 2
 
-    return delegates
+    return (mailbox, header.index(DELEGATE_CSV_USER_FIELD), access_rights)
 
 
-def update_delegate(netid, delegate, old_access_type, new_access_type):
+def set_delegate(netid, delegate, access_type, record_class=Delegate):
+    """
+    Returns with delegate access set for netid resource
+    """
+    url = _msca_set_delegate_url(netid, delegate, access_type)
+    body = _delegate_perms_body(netid, delegate, access_type)
+    return _write_delegates(
+        netid, "set_delegate", lambda: post_resource(url, body),
+        record_class)
+
+
+def update_delegate(netid, delegate, old_access_type, new_access_type,
+                    record_class=Delegate):
     """
     Returns with delegate access set for netid resource
     """
     url = _msca_update_delegate_url(
         netid, delegate, old_access_type, new_access_type)
-    body = json.dumps({
+    body = _update_delegate_perms_body(
+        netid, delegate, old_access_type, new_access_type)
+    return _write_delegates(
+        netid, "set_delegate", lambda: patch_resource(url, body),
+        record_class)
+
+
+def remove_delegate(netid, delegate, access_type, record_class=Delegate):
+    """
+    Returns with delegate access removed from netid resource
+    """
+    url = _msca_remove_delegate_url(netid, delegate, access_type)
+    body = _delegate_perms_body(netid, delegate, access_type)
+    return _write_delegates(
+        netid, "remove_delegate", lambda: post_resource(url, body),
+        record_class)
+
+
+def _delegate_perms_body(netid, delegate, access_type):
+    return json.dumps({
+        'netid': netid,
+        'delegate': delegate,
+        'accesstype': access_type
+    })
+
+
+def _update_delegate_perms_body(
+        netid, delegate, old_access_type, new_access_type):
+    return json.dumps({
         'netid': netid,
         'delegate': delegate,
         'RemoveAccesstype': old_access_type,
         'SetAccesstype': new_access_type,
     })
 
-    response = patch_resource(url, body)
 
-    delegates = []
+def _write_delegates(netid, operation, request, record_class=Delegate):
+    """
+    Returns delegate list from the response request() returns, keeping
+    netid's cached delegates coherent with the write
+    """
+    _invalidate_delegates(netid)
     try:
-        json_response = json.loads(response)
-        user = json_response['TargetNetid']
-        for delegate in json_response['Delegates']:
-            delegates.append(Delegate().from_json(user, delegate))
-    except Exception as ex:
-        logger.error("set_delegate response: -->{}<-- error: {}".format(
-            response, ex))
+        response = request()
+    except BaseException:
+        # the write may have been applied regardless
+        _invalidate_delegates(netid)
+        raise
 
-    return delegates
+    # discard any GET sent before the write was answered
+    generation = _invalidate_delegates(netid)
+    return _delegates_from_perms_response(
+        response, operation, record_class, netid, generation)
 
 
-def remove_delegate(netid, delegate, access_type):
+def _delegates_from_perms_response(response, operation, record_class=Delegate,
+                                   netid=None, generation=None):
     """
-    Returns with delegate access removed from netid resource
+    Returns delegate list from a Set/Update/RemoveDelegatePerms response,
+    which lists all of the mailbox's delegates, caching it if it is
+    netid's and generation, netid's generation when the write was answered,
+    is given
     """
-    url = _msca_remove_delegate_url(netid, delegate, access_type)
-    body = json.dumps({
-        'netid': netid,
-        'delegate': delegate,
-        'accesstype': access_type
-    })
-
-    response = post_resource(url, body)
-
-    delegates = []
     try:
-        json_response = json.loads(response)
-        user = json_response['TargetNetid']
-        for delegate in json_response['Delegates']:
-            delegates.append(Delegate().from_json(user, delegate))
+        mailbox, delegates = _parse_delegates(response)
+        if generation is not None and mailbox == netid:
+            _cache_delegates(netid, delegates, generation)
+            return _build_delegates(mailbox, delegates, record_class)
     except Exception as ex:
-        logger.error("remove_delegate response: -->{}<-- error: {}".format(
-            response, ex))
+        logger.error("{} response: -->{}<-- error: {}".format(
+            operation, response, ex))
+        mailbox, delegates = None, []
 
-    return delegates
+    if netid is not None:
+        _invalidate_delegates(netid)
+    return _build_delegates(mailbox, delegates, record_class)
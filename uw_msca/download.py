@@ -0,0 +1,164 @@
+# Copyright 2025 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Resumable, range-based download of large external resources, e.g., the
+drive state report and delegate csv blobs.
+"""
+
+import logging
+import re
+from concurrent.futures import ThreadPoolExecutor
+from restclients_core.exceptions import DataFailureException
+from urllib3.exceptions import HTTPError
+
+
+logger = logging.getLogger(__name__)
+
+CONTENT_RANGE = re.compile(r"bytes (\d+)-(\d+)/(\d+)")
+# answering a Range request on an empty resource with 416
+EMPTY_CONTENT_RANGE = re.compile(r"bytes \*/0")
+
+
+class RangedDownloader:
+    """
+    Downloads a resource in chunk_size byte ranges, resuming a range from
+    the last byte received when its transfer fails, and checking every
+    range against the first response's length and ETag.
+    """
+    def __init__(self, http, chunk_size=8 * 1024 * 1024, parallel=1,
+                 attempts=5):
+        """
+        Args:
+            http: urllib3 PoolManager to make requests with
+            chunk_size: bytes per range request
+            parallel: ranges requested concurrently
+            attempts: requests per range before giving up
+        """
+        self.http = http
+        self.chunk_size = chunk_size
+        self.parallel = parallel
+        self.attempts = attempts
+
+    def download(self, url):
+        """
+        Return the resource body bytes
+        """
+        first, total, etag = self._first_range(url)
+        if total is None:
+            # server ignored the Range header and sent everything
+            return first
+
+        data = bytearray(total)
+        data[:len(first)] = first
+        ranges = [(start, min(start + self.chunk_size, total) - 1)
+                  for start in range(len(first), total, self.chunk_size)]
+
+        def fetch(byte_range):
+            start, end = byte_range
+            data[start:end + 1] = self._fetch_range(url, start, end, etag)
+
+        if self.parallel > 1 and len(ranges) > 1:
+            with ThreadPoolExecutor(max_workers=self.parallel) as executor:
+                list(executor.map(fetch, ranges))
+        else:
+            for byte_range in ranges:
+                fetch(byte_range)
+
+        return bytes(data)
+
+    def _first_range(self, url):
+        """
+        Return the first range's bytes, the resource length and ETag, or
+        the whole body and None's if ranges are not supported.  An empty
+        resource is answered with 416 and Content-Range bytes */0.
+        """
+        for attempt in range(1, self.attempts + 1):
+            try:
+                response = self.http.request(
+                    "GET", url, headers={
+                        "Range": "bytes=0-{}".format(self.chunk_size - 1)})
+            except HTTPError as ex:
+                self._log_retry(url, 0, attempt, ex)
+                continue
+
+            if response.status == 200:
+                return response.data, None, None
+
+            if response.status == 416 and EMPTY_CONTENT_RANGE.fullmatch(
+                    response.headers.get("Content-Range", "")):
+                return b"", 0, response.headers.get("ETag")
+
+            if response.status != 206:
+                raise DataFailureException(
+                    url, response.status, response.data)
+
+            match = CONTENT_RANGE.match(
+                response.headers.get("Content-Range", ""))
+            if match is None:
+                raise DataFailureException(
+                    url, response.status, "Malformed Content-Range: {}"
+                    .format(response.headers.get("Content-Range")))
+
+            total = int(match.group(3))
+            expected = min(self.chunk_size, total)
+            if len(response.data) != expected:
+                self._log_retry(url, 0, attempt, "short read")
+                continue
+
+            return response.data, total, response.headers.get("ETag")
+
+        raise DataFailureException(url, 0, "Range download failed")
+
+    def _fetch_range(self, url, start, end, etag):
+        received = bytearray()
+        for attempt in range(1, self.attempts + 1):
+            offset = start + len(received)
+            headers = {"Range": "bytes={}-{}".format(offset, end)}
+            if etag:
+                headers["If-Match"] = etag
+
+            try:
+                # keep the bytes of a short read to resume after them
+                response = self.http.request(
+                    "GET", url, headers=headers, preload_content=False,
+                    enforce_content_length=False)
+            except HTTPError as ex:
+                self._log_retry(url, offset, attempt, ex)
+                continue
+
+            try:
+                if response.status != 206:
+                    # 412 when the resource changed under us
+                    raise DataFailureException(
+                        url, response.status, response.data)
+
+                if etag and response.headers.get("ETag") not in (None, etag):
+                    raise DataFailureException(
+                        url, response.status, "ETag changed during download")
+
+                try:
+                    for chunk in response.stream(64 * 1024):
+                        received += chunk
+                except HTTPError as ex:
+                    self._log_retry(url, start + len(received), attempt, ex)
+                    continue
+            finally:
+                response.release_conn()
+
+            if len(received) == end - start + 1:
+                return received
+
+            if len(received) > end - start + 1:
+                raise DataFailureException(
+                    url, response.status, "Range {}-{} too long".format(
+                        start, end))
+
+            self._log_retry(url, start + len(received), attempt, "short read")
+
+        raise DataFailureException(
+            url, 0, "Range {}-{} download failed".format(start, end))
+
+    def _log_retry(self, url, offset, attempt, reason):
+        logger.warning("ranged download {} at byte {} attempt {}: {}".format(
+            url, offset, attempt, reason))
@@ -0,0 +1,223 @@
+# Copyright 2025 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Incremental diff of successive PPLAT drive state reports.
+
+The report is saved to a snapshot directory partitioned into bucket files
+by drive_id.  Diffing a new report streams it into new bucket files, then
+compares one bucket at a time against the previous snapshot, so neither
+report is ever held in memory whole.  Once every change has been yielded
+the new snapshot replaces the previous one.
+"""
+
+import csv
+import json
+import os
+import shutil
+import tempfile
+import zlib
+from restclients_core import models
+from uw_msca.models import GoogleDriveStateRecord
+from uw_msca.shared_drive import iter_google_drive_states
+
+
+DEFAULT_BUCKETS = 64
+MANIFEST = "manifest.json"
+
+# columns of the snapshot bucket files, then those that are per drive
+SNAPSHOT_FIELDS = (
+    "drive_id", "member", "role", "size", "org_unit_name", "drive_name")
+DRIVE_FIELDS = ("size", "org_unit_name", "drive_name")
+
+
+class DriveStateChange(models.Model):
+    DRIVE_ADDED = "drive_added"
+    DRIVE_REMOVED = "drive_removed"
+    DRIVE_CHANGED = "drive_changed"
+    MEMBER_ADDED = "member_added"
+    MEMBER_REMOVED = "member_removed"
+    MEMBER_CHANGED = "member_changed"
+
+    change = models.CharField(max_length=16)
+    drive_id = models.SlugField(max_length=19)
+    member = models.SlugField(max_length=66)
+
+    def __init__(self, *args, **kwargs):
+        # field name to (previous value, new value)
+        self.fields = {}
+        super().__init__(*args, **kwargs)
+
+    def json_data(self):
+        return {
+            "change": self.change,
+            "drive_id": self.drive_id,
+            "member": self.member,
+            "fields": self.fields,
+        }
+
+    def __str__(self):
+        return json.dumps(self.json_data())
+
+
+def diff_google_drive_states(snapshot_dir, drive_states=None):
+    """
+    Yield DriveStateChange's between the report saved in snapshot_dir and
+    drive_states, then save drive_states as the snapshot.
+
+    Args:
+        snapshot_dir: snapshot directory path, a missing snapshot yields
+            every drive and member as added
+        drive_states: optional iterable of GoogleDriveState's, the report
+            is streamed from PPLAT when not provided
+    """
+    if drive_states is None:
+        drive_states = iter_google_drive_states(
+            record_class=GoogleDriveStateRecord)
+
+    manifest = _read_manifest(snapshot_dir)
+    buckets = manifest.get("buckets", DEFAULT_BUCKETS)
+
+    parent = os.path.dirname(os.path.abspath(snapshot_dir))
+    os.makedirs(parent, exist_ok=True)
+    new_dir = tempfile.mkdtemp(dir=parent, prefix=".drive_state_snapshot-")
+    try:
+        _write_snapshot(new_dir, drive_states, buckets)
+        for bucket in range(buckets):
+            previous = _read_bucket(snapshot_dir, bucket) if manifest else {}
+            current = _read_bucket(new_dir, bucket)
+            yield from _diff_bucket(previous, current)
+
+        _replace_snapshot(snapshot_dir, new_dir)
+    finally:
+        if os.path.isdir(new_dir):
+            shutil.rmtree(new_dir)
+
+
+def save_drive_state_snapshot(snapshot_dir, drive_states):
+    """
+    Save drive_states as the snapshot in snapshot_dir
+    """
+    for change in diff_google_drive_states(snapshot_dir, drive_states):
+        pass
+
+
+def _diff_bucket(previous, current):
+    for drive_id, (drive, members) in current.items():
+        try:
+            previous_drive, previous_members = previous.pop(drive_id)
+        except KeyError:
+            yield _change(DriveStateChange.DRIVE_ADDED, drive_id,
+                          fields=_fields(None, drive))
+            for member, role in members.items():
+                yield _change(DriveStateChange.MEMBER_ADDED, drive_id,
+                              member, {"role": (None, role)})
+            continue
+
+        if previous_drive != drive:
+            yield _change(DriveStateChange.DRIVE_CHANGED, drive_id,
+                          fields=_fields(previous_drive, drive))
+
+        for member, role in members.items():
+            previous_role = previous_members.pop(member, None)
+            if previous_role is None:
+                yield _change(DriveStateChange.MEMBER_ADDED, drive_id,
+                              member, {"role": (None, role)})
+            elif previous_role != role:
+                yield _change(DriveStateChange.MEMBER_CHANGED, drive_id,
+                              member, {"role": (previous_role, role)})
+
+        for member, role in previous_members.items():
+            yield _change(DriveStateChange.MEMBER_REMOVED, drive_id,
+                          member, {"role": (role, None)})
+
+    for drive_id, (drive, members) in previous.items():
+        yield _change(DriveStateChange.DRIVE_REMOVED, drive_id,
+                      fields=_fields(drive, None))
+        for member, role in members.items():
+            yield _change(DriveStateChange.MEMBER_REMOVED, drive_id,
+                          member, {"role": (role, None)})
+
+
+def _change(change, drive_id, member=None, fields=None):
+    drive_state_change = DriveStateChange(
+        change=change, drive_id=drive_id, member=member)
+    drive_state_change.fields = fields or {}
+    return drive_state_change
+
+
+def _fields(previous, current):
+    """
+    Return the drive fields that differ as (previous value, new value)
+    """
+    fields = {}
+    for i, name in enumerate(DRIVE_FIELDS):
+        old = _field_value(name, previous[i]) if previous else None
+        new = _field_value(name, current[i]) if current else None
+        if old != new:
+            fields[name] = (old, new)
+
+    return fields
+
+
+def _field_value(name, value):
+    if name == "size":
+        return int(value) if value.isdigit() else 0
+    return value
+
+
+def _bucket_path(snapshot_dir, bucket):
+    return os.path.join(snapshot_dir, "bucket-{:04d}.csv".format(bucket))
+
+
+def _write_snapshot(snapshot_dir, drive_states, buckets):
+    files = [open(_bucket_path(snapshot_dir, i), "w", newline="")
+             for i in range(buckets)]
+    try:
+        writers = [csv.writer(f) for f in files]
+        for drive_state in drive_states:
+            drive_id = drive_state.drive_id
+            bucket = zlib.crc32(drive_id.encode("utf-8")) % buckets
+            writers[bucket].writerow(
+                [getattr(drive_state, name) for name in SNAPSHOT_FIELDS])
+    finally:
+        for f in files:
+            f.close()
+
+    with open(os.path.join(snapshot_dir, MANIFEST), "w") as f:
+        json.dump({"buckets": buckets}, f)
+
+
+def _read_manifest(snapshot_dir):
+    try:
+        with open(os.path.join(snapshot_dir, MANIFEST)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def _read_bucket(snapshot_dir, bucket):
+    """
+    Return dict of drive_id to (drive field values, dict of member to role)
+    """
+    drives = {}
+    with open(_bucket_path(snapshot_dir, bucket), newline="") as f:
+        for (drive_id, member, role, *drive) in csv.reader(f):
+            try:
+                drives[drive_id][1][member] = role
+            except KeyError:
+                drives[drive_id] = (tuple(drive), {member: role})
+
+    return drives
+
+
+def _replace_snapshot(snapshot_dir, new_dir):
+    previous_dir = None
+    if os.path.isdir(snapshot_dir):
+        previous_dir = new_dir + "-previous"
+        os.rename(snapshot_dir, previous_dir)
+
+    os.rename(new_dir, snapshot_dir)
+
+    if previous_dir:
+        shutil.rmtree(previous_dir)
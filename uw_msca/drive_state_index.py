@@ -0,0 +1,115 @@
+# Copyright 2025 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Query indexes over the PPLAT drive state report.
+"""
+
+from bisect import bisect_left, bisect_right
+from operator import attrgetter
+from uw_msca.models import GoogleDriveStateRecord
+from uw_msca.shared_drive import get_google_drives, iter_google_drive_states
+
+
+class DriveStateIndex:
+    """
+    Drives of a drive state report indexed by drive_id, member and org
+    unit, with sorted indexes on size and on quota utilization.
+
+    Query results are GoogleDrive's.
+    """
+    def __init__(self, drive_states=None):
+        """
+        Args:
+            drive_states: optional iterable of GoogleDriveState's, the
+                report is streamed from PPLAT when not provided
+        """
+        if drive_states is None:
+            drive_states = iter_google_drive_states(
+                record_class=GoogleDriveStateRecord)
+
+        self.by_drive_id = get_google_drives(drive_states)
+        self.by_member = {}
+        self.by_org_unit = {}
+        utilization = {}
+
+        for drive in self.by_drive_id.values():
+            for member in drive.members:
+                self.by_member.setdefault(member.member, []).append(
+                    (member.role, drive))
+
+            self.by_org_unit.setdefault(drive.org_unit_name, []).append(drive)
+
+            try:
+                ratio = drive.size_gigabytes / drive.quota_limit
+            except (ValueError, ZeroDivisionError, TypeError):
+                # org units that aren't quotas, e.g., "uw.edu"
+                continue
+            utilization.setdefault(drive.org_unit_name, []).append(
+                (ratio, drive))
+
+        self._by_size = sorted(
+            self.by_drive_id.values(), key=attrgetter("size"))
+        self._sizes = [drive.size for drive in self._by_size]
+
+        self._by_utilization = {}
+        for org_unit_name, drives in utilization.items():
+            drives.sort(key=lambda entry: entry[0])
+            self._by_utilization[org_unit_name] = (
+                [ratio for (ratio, drive) in drives],
+                [drive for (ratio, drive) in drives])
+
+    def get_drive(self, drive_id):
+        return self.by_drive_id.get(drive_id)
+
+    def drives_for_member(self, member, role=None):
+        """
+        Return drives member belongs to, optionally only with role
+        """
+        return [drive for (member_role, drive)
+                in self.by_member.get(member, [])
+                if role is None or member_role == role]
+
+    def drives_in_org_unit(self, org_unit_name):
+        return list(self.by_org_unit.get(org_unit_name, []))
+
+    def drives_in_size_range(self, min_size=None, max_size=None):
+        """
+        Return drives, smallest first, with min_size <= size <= max_size,
+        sizes in MB as reported
+        """
+        start = 0 if min_size is None else bisect_left(self._sizes, min_size)
+        end = (len(self._sizes) if max_size is None
+               else bisect_right(self._sizes, max_size))
+        return self._by_size[start:end]
+
+    def top_by_size(self, n):
+        """
+        Return the n largest drives, largest first
+        """
+        return self._by_size[-n:][::-1] if n > 0 else []
+
+    def drives_over_utilization(self, ratio, org_unit_name=None):
+        """
+        Return drives using at least ratio of their org unit quota, e.g.,
+        0.9 for 90% full, most utilized first
+
+        Args:
+            org_unit_name: optionally only drives in this org unit
+        """
+        if org_unit_name is None:
+            org_unit_names = self._by_utilization.keys()
+        else:
+            org_unit_names = [org_unit_name]
+
+        drives = []
+        for name in org_unit_names:
+            ratios, ou_drives = self._by_utilization.get(name, ([], []))
+            start = bisect_left(ratios, ratio)
+            drives.extend(zip(ratios[start:], ou_drives[start:]))
+
+        drives.sort(key=lambda entry: entry[0], reverse=True)
+        return [drive for (_, drive) in drives]
+
+    def __len__(self):
+        return len(self.by_drive_id)
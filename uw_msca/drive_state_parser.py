@@ -0,0 +1,104 @@
+# Copyright 2025 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Multi-process parsing of large PPLAT drive state reports.
+
+The downloaded report is split on record boundaries, taking care that
+quoted fields, e.g., drive_name, may contain commas and newlines, and
+the pieces are parsed in a process pool.  Results are merged in report
+order.
+"""
+
+import csv
+import io
+from concurrent.futures import ProcessPoolExecutor
+from restclients_core import models
+
+
+def split_csv_records(data, parts, start=0):
+    """
+    Return offsets dividing data[start:] into up to parts pieces of whole
+    csv records, beginning with start and ending with len(data)
+    """
+    bounds = [start]
+    step = max((len(data) - start) // max(parts, 1), 1)
+    for i in range(1, parts):
+        target = start + i * step
+        if target >= len(data):
+            break
+        if target <= bounds[-1]:
+            continue
+
+        # bounds[-1] starts a record, so is outside quotes
+        quoted = data.count(b'"', bounds[-1], target) % 2 == 1
+        bound = record_start(data, target, quoted)
+        if bound >= len(data):
+            break
+        bounds.append(bound)
+
+    if bounds[-1] < len(data):
+        bounds.append(len(data))
+
+    return bounds
+
+
+def record_start(data, offset, quoted=False):
+    """
+    Return the offset of the first csv record starting after offset,
+    quoted being whether offset is within a quoted field
+    """
+    while True:
+        newline = data.find(b"\n", offset)
+        if newline < 0:
+            return len(data)
+
+        quoted ^= data.count(b'"', offset, newline) % 2 == 1
+        offset = newline + 1
+        if not quoted:
+            return offset
+
+
+def parse_drive_states(data, record_class, processes, chunks=None):
+    """
+    Return list of record_class instances parsed from report bytes data
+    using a pool of processes
+
+    Args:
+        chunks: pieces to split the report into, defaults to four per
+            process to even out uneven pieces
+    """
+    header_end = record_start(data, 0)
+    fieldnames = next(csv.reader(io.StringIO(
+        data[:header_end].decode("utf-8"), newline="")), [])
+    decode = record_class.csv_decoder(fieldnames)
+
+    bounds = split_csv_records(data, chunks or processes * 4, header_end)
+    pieces = [data[start:end] for (start, end) in zip(bounds, bounds[1:])]
+
+    # restclients_core Models cannot be pickled, so are decoded here
+    # from the rows parsed by the pool
+    decode_in_pool = not issubclass(record_class, models.Model)
+
+    result = []
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        for parsed in executor.map(
+                _parse_piece, pieces,
+                [fieldnames] * len(pieces),
+                [record_class if decode_in_pool else None] * len(pieces)):
+            if decode_in_pool:
+                result.extend(parsed)
+            else:
+                result.extend(decode(row) for row in parsed)
+
+    return result
+
+
+def _parse_piece(piece, fieldnames, record_class):
+    rows = [row for row in csv.reader(
+        io.StringIO(piece.decode("utf-8"), newline="")) if row]
+    if record_class is None:
+        return rows
+
+    decode = record_class.csv_decoder(fieldnames)
+    return [decode(row) for row in rows]
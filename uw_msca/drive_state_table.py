@@ -0,0 +1,222 @@
+# Copyright 2025 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Compact binary columnar files of parsed PPLAT drive state reports.
+
+Strings are stored once in a shared string table and referenced from
+per-column uint32 index arrays, integers are stored as int64 arrays.
+Loading maps the file with mmap, so worker processes loading the same
+file share a single page-cached copy and skip parsing the csv report.
+
+File layout, in native byte order, sections aligned to 8 bytes:
+
+    header: magic, byte order, rows, strings, string data length
+    string offsets: uint64[strings + 1]
+    string data: utf-8
+    string columns: uint32[rows] per STRING_COLUMNS
+    integer columns: int64[rows] per INT_COLUMNS
+"""
+
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from uw_msca.models import GoogleDriveState, GoogleDriveStateRecord
+
+
+MAGIC = b"MSCADST1"
+HEADER = struct.Struct("<8s8sQQQ")
+
+STRING_COLUMNS = (
+    "id",
+    "drive_id",
+    "drive_name",
+    "member",
+    "role",
+    "org_unit_id",
+    "org_unit_name",
+    "query_date",
+    "size_query_date",
+)
+INT_COLUMNS = (
+    "total_members",
+    "total_uw_owners",
+    "size",
+    "file_count",
+)
+
+
+def save_drive_state_table(path, drive_states):
+    """
+    Write drive_states, an iterable of GoogleDriveState's, to path
+
+    The file is written alongside path and renamed over it, so tables
+    already loaded from path keep mapping the file they loaded.
+    """
+    strings = {}
+    string_columns = {name: array("I") for name in STRING_COLUMNS}
+    int_columns = {name: array("q") for name in INT_COLUMNS}
+
+    rows = 0
+    for drive_state in drive_states:
+        rows += 1
+        for name, column in string_columns.items():
+            value = getattr(drive_state, name, None)
+            value = "" if value is None else str(value)
+            try:
+                column.append(strings[value])
+            except KeyError:
+                strings[value] = len(strings)
+                column.append(strings[value])
+
+        for name, column in int_columns.items():
+            column.append(GoogleDriveState._int(
+                getattr(drive_state, name, 0) or 0))
+
+    offsets = array("Q", [0])
+    data = bytearray()
+    for value in strings:
+        data += value.encode("utf-8")
+        offsets.append(len(data))
+
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(HEADER.pack(MAGIC, sys.byteorder.encode().ljust(8),
+                                rows, len(strings), len(data)))
+            f.write(offsets.tobytes())
+            f.write(data)
+            _pad(f)
+            for name in STRING_COLUMNS:
+                f.write(string_columns[name].tobytes())
+            _pad(f)
+            for name in INT_COLUMNS:
+                f.write(int_columns[name].tobytes())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def load_drive_state_table(path):
+    """
+    Return a DriveStateTable mapping the file at path
+    """
+    return DriveStateTable(path)
+
+
+class DriveStateTable:
+    """
+    Read-only sequence of GoogleDriveStateRecord's backed by a mmap'd
+    drive state table file.
+    """
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        view = memoryview(self._mmap)
+        self._views = [view]
+        try:
+            (magic, byteorder, self.rows, strings,
+             data_length) = HEADER.unpack_from(view)
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not a drive state table")
+            if byteorder.strip() != sys.byteorder.encode():
+                raise ValueError(f"{path} byte order is {byteorder}")
+
+            offset = HEADER.size
+            self._offsets = self._cast(view, offset, strings + 1, "Q")
+            offset += self._offsets.nbytes
+            self._data = self._slice(view, offset, data_length)
+            offset = _aligned(offset + data_length)
+
+            self._columns = {}
+            for name in STRING_COLUMNS:
+                self._columns[name] = self._cast(view, offset, self.rows, "I")
+                offset += self._columns[name].nbytes
+            offset = _aligned(offset)
+            for name in INT_COLUMNS:
+                self._columns[name] = self._cast(view, offset, self.rows, "q")
+                offset += self._columns[name].nbytes
+        except Exception:
+            self.close()
+            raise
+
+        self._strings = [None] * strings
+
+    def string(self, index):
+        """
+        Return string table entry index, decoded once
+        """
+        value = self._strings[index]
+        if value is None:
+            value = sys.intern(str(
+                self._data[self._offsets[index]:self._offsets[index + 1]],
+                "utf-8"))
+            self._strings[index] = value
+        return value
+
+    def column(self, name):
+        """
+        Return a memoryview of an integer column, or a list of a string
+        column's values
+        """
+        if name in INT_COLUMNS:
+            return self._columns[name]
+        return [self.string(i) for i in self._columns[name]]
+
+    def __len__(self):
+        return self.rows
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self.rows
+        if not 0 <= i < self.rows:
+            raise IndexError("drive state table index out of range")
+
+        fields = {name: self.string(self._columns[name][i])
+                  for name in STRING_COLUMNS}
+        for name in INT_COLUMNS:
+            fields[name] = self._columns[name][i]
+        # file_count is kept as its csv string by GoogleDriveState
+        fields["file_count"] = str(fields["file_count"])
+        return GoogleDriveStateRecord(**fields)
+
+    def __iter__(self):
+        for i in range(self.rows):
+            yield self[i]
+
+    def close(self):
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _slice(self, view, offset, length):
+        sliced = view[offset:offset + length]
+        self._views.append(sliced)
+        return sliced
+
+    def _cast(self, view, offset, count, typecode):
+        sliced = self._slice(view, offset, count * array(typecode).itemsize)
+        cast = sliced.cast(typecode)
+        self._views.append(cast)
+        return cast
+
+
+def _aligned(offset):
+    return (offset + 7) & ~7
+
+
+def _pad(f):
+    f.write(b"\0" * (_aligned(f.tell()) - f.tell()))
@@ -0,0 +1,37 @@
+# Copyright 2025 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+JSON decoding with orjson when it is installed, falling back to the
+standard library.  Input orjson rejects, e.g., UTF-16 or non-finite
+numbers, is decoded by the standard library, so whatever json.loads
+accepts decodes, and malformed input raises json.JSONDecodeError.
+
+orjson decodes integers beyond 64 bits as floats where json.loads keeps
+them exact; set RESTCLIENTS_MSCA_FAST_JSON = False to always use the
+standard library.
+"""
+
+import json
+from commonconf import settings
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def loads(data):
+    """
+    Return the object decoded from JSON str or bytes data
+    """
+    if orjson is not None and getattr(
+            settings, 'RESTCLIENTS_MSCA_FAST_JSON', True):
+        try:
+            # json.loads skips a leading UTF-8 BOM, orjson rejects it
+            if data[:3] == b"\xef\xbb\xbf":
+                return orjson.loads(data[3:])
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data)
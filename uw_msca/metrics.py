@@ -0,0 +1,194 @@
+# Copyright 2025 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Per-endpoint request metrics for MSCA and external resource requests.
+
+Every request made through the uw_msca resource functions is recorded
+with the collector set by set_collector, by default an in-memory
+MetricsCollector that prometheus_text exports.  Endpoints are recorded
+as url templates, e.g., /mbx/v1/{netid}/GetDelegates, so that metrics
+aren't kept per netid or drive_id.
+"""
+
+import logging
+import threading
+from bisect import bisect_left
+from urllib.parse import urlsplit
+
+
+logger = logging.getLogger(__name__)
+
+# latency histogram bucket upper bounds in seconds
+DEFAULT_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+
+class EndpointMetrics:
+    __slots__ = ("count", "latency_sum", "buckets", "bytes_received",
+                 "retries")
+
+    def __init__(self, buckets):
+        self.count = 0
+        self.latency_sum = 0.0
+        self.buckets = [0] * (len(buckets) + 1)
+        self.bytes_received = 0
+        self.retries = 0
+
+    def copy(self):
+        copy = EndpointMetrics(())
+        copy.count = self.count
+        copy.latency_sum = self.latency_sum
+        copy.buckets = list(self.buckets)
+        copy.bytes_received = self.bytes_received
+        copy.retries = self.retries
+        return copy
+
+
+class MetricsCollector:
+    """
+    Thread-safe in-memory request metrics, keyed by endpoint template,
+    method and status.
+    """
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.bucket_bounds = tuple(sorted(buckets))
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def record(self, endpoint, method, status, seconds, bytes_received=0,
+               retries=0):
+        key = (endpoint, method, status)
+        bucket = bisect_left(self.bucket_bounds, seconds)
+        with self._lock:
+            metrics = self._metrics.get(key)
+            if metrics is None:
+                metrics = self._metrics[key] = EndpointMetrics(
+                    self.bucket_bounds)
+            metrics.count += 1
+            metrics.latency_sum += seconds
+            metrics.buckets[bucket] += 1
+            metrics.bytes_received += bytes_received
+            metrics.retries += retries
+
+    def snapshot(self):
+        """
+        Return dict of (endpoint, method, status) to EndpointMetrics
+        """
+        with self._lock:
+            return {key: metrics.copy()
+                    for (key, metrics) in self._metrics.items()}
+
+    def reset(self):
+        with self._lock:
+            self._metrics.clear()
+
+
+_collector = MetricsCollector()
+
+
+def get_collector():
+    return _collector
+
+
+def set_collector(collector):
+    """
+    Record metrics with collector, any object with a MetricsCollector
+    compatible record method, or None to stop recording
+    """
+    global _collector
+    _collector = collector
+
+
+def endpoint_template(url):
+    """
+    Return url with netids and drive_ids replaced by placeholders and the
+    query string removed, or just the scheme and host of an external url
+    """
+    parts = urlsplit(url)
+    if parts.netloc:
+        return "{}://{}".format(parts.scheme, parts.netloc)
+
+    # e.g., ["", "mbx", "v1", netid, "SetDelegatePerms", delegate, ...]
+    segments = parts.path.split("/")
+    if len(segments) > 5 and segments[1] == "google":
+        segments[4] = "{drive_id}"
+    elif len(segments) > 4 and segments[1] == "mbx":
+        segments[3] = "{netid}"
+        if len(segments) > 5:
+            segments[5] = "{delegate}"
+
+    return "/".join(segments)
+
+
+def response_retries(response):
+    """
+    Return the number of retries urllib3 made for response
+    """
+    retries = getattr(response, "retries", None)
+    return len(getattr(retries, "history", None) or ())
+
+
+def record(method, url, status, seconds, bytes_received=0, retries=0):
+    """
+    Record a request with the current collector
+    """
+    collector = _collector
+    if collector is None:
+        return
+
+    try:
+        collector.record(endpoint_template(url), method, status, seconds,
+                         bytes_received, retries)
+    except Exception as ex:
+        logger.error("metrics collector failed: {}".format(ex))
+
+
+def prometheus_text(collector=None):
+    """
+    Return the collector's, by default the current collector's, metrics
+    in the Prometheus text exposition format
+    """
+    collector = collector or _collector
+    snapshot = sorted(collector.snapshot().items())
+
+    lines = [
+        "# HELP uw_msca_request_duration_seconds MSCA request latency",
+        "# TYPE uw_msca_request_duration_seconds histogram",
+    ]
+    for key, metrics in snapshot:
+        labels = _labels(key)
+        cumulative = 0
+        bounds = list(collector.bucket_bounds) + ["+Inf"]
+        for bound, count in zip(bounds, metrics.buckets):
+            cumulative += count
+            lines.append(
+                'uw_msca_request_duration_seconds_bucket{{{},le="{}"}} {}'
+                .format(labels, bound, cumulative))
+        lines.append("uw_msca_request_duration_seconds_sum{{{}}} {}".format(
+            labels, metrics.latency_sum))
+        lines.append("uw_msca_request_duration_seconds_count{{{}}} {}".format(
+            labels, metrics.count))
+
+    for name, attr, help_text in (
+            ("uw_msca_response_bytes_total", "bytes_received",
+             "MSCA response body bytes received"),
+            ("uw_msca_request_retries_total", "retries",
+             "MSCA request retries")):
+        lines.append("# HELP {} {}".format(name, help_text))
+        lines.append("# TYPE {} counter".format(name))
+        for key, metrics in snapshot:
+            lines.append("{}{{{}}} {}".format(
+                name, _labels(key), getattr(metrics, attr)))
+
+    return "\n".join(lines) + "\n"
+
+
+def _labels(key):
+    endpoint, method, status = key
+    return 'endpoint="{}",method="{}",status="{}"'.format(
+        _escape(endpoint), _escape(method), status)
+
+
+def _escape(value):
+    return (str(value).replace("\\", "\\\\").replace('"', '\\"')
+            .replace("\n", "\\n"))
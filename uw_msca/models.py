@@ -2,6 +2,7 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import json
+import sys
 from restclients_core import models
 
 
@@ -60,6 +61,66 @@ class Delegate(models.Model):
         return json.dumps(self.json_data())
 
 
+class DelegateRecord:
+    """
+    Lightweight alternative to Delegate for mailboxes with many delegates.
+
+    Attributes match Delegate, but values live in __slots__ and the
+    mailbox and access right strings are interned.
+    """
+    __slots__ = ("user", "delegate", "access_right")
+
+    def __init__(self, user=None, delegate=None, access_right=None):
+        self.user = sys.intern(user) if user else user
+        self.delegate = delegate
+        self.access_right = (
+            sys.intern(access_right) if access_right else access_right)
+
+    def from_json(self, user, data):
+        self.__init__(user, data["User"], data["AccessRights"])
+        return self
+
+    def json_data(self):
+        return {
+            "user": self.user,
+            "delegate": self.delegate,
+            "access_right": self.access_right,
+        }
+
+    def __str__(self):
+        return json.dumps(self.json_data())
+
+
+class DelegateIndex:
+    """
+    Delegates indexed by mailbox and by delegate.
+    """
+    def __init__(self, delegates=()):
+        self.by_mailbox = {}
+        self.by_delegate = {}
+        for delegate in delegates:
+            self.add(delegate)
+
+    def add(self, delegate):
+        self.by_mailbox.setdefault(delegate.user, []).append(delegate)
+        self.by_delegate.setdefault(delegate.delegate, []).append(delegate)
+
+    def delegates_for(self, mailbox):
+        """
+        Return the Delegates granted access to mailbox
+        """
+        return self.by_mailbox.get(mailbox, [])
+
+    def mailboxes_for(self, delegate):
+        """
+        Return the Delegates describing the mailboxes delegate can access
+        """
+        return self.by_delegate.get(delegate, [])
+
+    def __len__(self):
+        return sum(len(d) for d in self.by_mailbox.values())
+
+
 class AccessRight(models.Model):
     right_id = models.SmallIntegerField()
     displayname = models.SlugField(max_length=32)
@@ -76,7 +137,49 @@ class AccessRight(models.Model):
         return json.dumps(self.json_data())
 
 
-class GoogleDriveState(models.Model):
+class AccessRightRecord:
+    """
+    Lightweight alternative to AccessRight, attributes in __slots__
+    """
+    __slots__ = ("right_id", "displayname")
+
+    def __init__(self, right_id=None, displayname=None):
+        self.right_id = right_id
+        self.displayname = displayname
+
+    def from_json(self, data):
+        self.right_id = data.get("id")
+        self.displayname = data.get("displayname")
+        return self
+
+    def json_data(self):
+        return {"displayname": self.displayname, "id": self.right_id}
+
+    def __str__(self):
+        return json.dumps(self.json_data())
+
+
+class DriveQuotaMixin:
+    """
+    Quota and size helpers shared by the drive report models.
+    """
+    __slots__ = ()
+
+    @property
+    def quota_limit(self):
+        return Quota.to_int(self.org_unit_name)
+
+    @property
+    def size_gigabytes(self):
+        """
+        Return size in GB.
+
+        Native size field is in MB.
+        """
+        return self.size / 1024
+
+
+class GoogleDriveState(DriveQuotaMixin, models.Model):
     # max_length values informed by examining all current results
     # TODO: more thorough solution
     drive_id = models.SlugField(max_length=19)
@@ -113,19 +216,6 @@ class GoogleDriveState(models.Model):
         "total_uwowners": "total_uw_owners"
     }
 
-    @property
-    def quota_limit(self):
-        return Quota.to_int(self.org_unit_name)
-
-    @property
-    def size_gigabytes(self):
-        """
-        Return size in GB.
-
-        Native size field is in MB.
-        """
-        return self.size / 1024
-
     @classmethod
     def from_csv(cls, csv_data: dict):
         """
@@ -134,6 +224,40 @@ class GoogleDriveState(models.Model):
         fields = dict([cls._map(k, v) for (k, v) in csv_data.items()])
         return cls(**fields)
 
+    @classmethod
+    def csv_decoder(cls, fieldnames, record_class=None):
+        """
+        Return a function creating instances from csv.reader rows.
+
+        Field names and value conversions are resolved once from the
+        header row so decoding a row involves no per-cell field lookups.
+        """
+        record_class = record_class or cls
+        str_columns = []
+        int_columns = []
+        for i, k in enumerate(fieldnames):
+            field_name, _ = cls._map(k, "")
+            if 'Integer' in cls._field_class(field_name):
+                int_columns.append((i, field_name))
+            else:
+                str_columns.append((i, field_name))
+
+        width = len(fieldnames)
+        to_int = cls._int
+
+        def decode(row):
+            if len(row) != width:
+                raise ValueError(
+                    f"Expected {width} fields, got {len(row)}: {row}")
+
+            fields = {name: row[i] for (i, name) in str_columns}
+            for (i, name) in int_columns:
+                fields[name] = to_int(row[i])
+
+            return record_class(**fields)
+
+        return decode
+
     @classmethod
     def _map(cls, k, v):
         """
@@ -176,6 +300,169 @@ class GoogleDriveState(models.Model):
             return 0
 
 
+class GoogleDriveStateRecord(DriveQuotaMixin):
+    """
+    Lightweight alternative to GoogleDriveState for holding large reports.
+
+    Attributes match GoogleDriveState, but values live in __slots__ and
+    the heavily repeated strings are interned, so a row costs a fraction
+    of a Model instance.
+    """
+    __slots__ = (
+        "id",
+        "drive_id",
+        "drive_name",
+        "member",
+        "role",
+        "total_members",
+        "total_uw_owners",
+        "org_unit_id",
+        "org_unit_name",
+        "query_date",
+        "size",
+        "file_count",
+        "size_query_date",
+    )
+
+    INTERNED_FIELDS = frozenset((
+        "drive_id",
+        "drive_name",
+        "member",
+        "role",
+        "org_unit_id",
+        "org_unit_name",
+        "query_date",
+        "size_query_date",
+    ))
+
+    def __init__(self, **kwargs):
+        for name in self.__slots__:
+            value = kwargs.get(name)
+            if name in self.INTERNED_FIELDS and isinstance(value, str):
+                value = sys.intern(value)
+            setattr(self, name, value)
+
+    @classmethod
+    def from_csv(cls, csv_data: dict):
+        """
+        Factory for creating from CSV data from a csv.DictReader.
+        """
+        fields = dict([
+            GoogleDriveState._map(k, v) for (k, v) in csv_data.items()])
+        return cls(**fields)
+
+    @classmethod
+    def csv_decoder(cls, fieldnames):
+        """
+        Return a function creating instances from csv.reader rows.
+        """
+        return GoogleDriveState.csv_decoder(fieldnames, record_class=cls)
+
+    def json_data(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __str__(self):
+        return json.dumps(self.json_data())
+
+
+class GoogleDriveMember(models.Model):
+    member = models.SlugField(max_length=66)
+    role = models.CharField(max_length=13)
+
+    def json_data(self):
+        return {"member": self.member, "role": self.role}
+
+    def __str__(self):
+        return json.dumps(self.json_data())
+
+
+class GoogleDrive(DriveQuotaMixin, models.Model):
+    """
+    A shared drive aggregated from the per-member drive state report rows.
+    """
+    drive_id = models.SlugField(max_length=19)
+    drive_name = models.TextField()
+    total_members = models.PositiveIntegerField()
+    org_unit_id = models.SlugField(max_length=15)
+    org_unit_name = models.SlugField(max_length=20)
+    query_date = models.DateTimeField()
+    total_uw_owners = models.PositiveIntegerField()
+    size = models.PositiveIntegerField()
+    file_count = models.PositiveIntegerField()
+
+    @classmethod
+    def from_drive_state(cls, drive_state):
+        """
+        Factory for creating from the first GoogleDriveState row of a drive.
+        """
+        drive = cls(
+            drive_id=drive_state.drive_id,
+            drive_name=drive_state.drive_name,
+            total_members=drive_state.total_members,
+            org_unit_id=drive_state.org_unit_id,
+            org_unit_name=drive_state.org_unit_name,
+            query_date=drive_state.query_date,
+            total_uw_owners=drive_state.total_uw_owners,
+            size=drive_state.size,
+            file_count=GoogleDriveState._int(
+                getattr(drive_state, "file_count", None) or 0))
+        drive.members = []
+        drive.add_member(drive_state)
+        return drive
+
+    def add_member(self, drive_state):
+        self.members.append(GoogleDriveMember(
+            member=drive_state.member, role=drive_state.role))
+
+    def members_with_role(self, role):
+        return [m.member for m in self.members if m.role == role]
+
+    def json_data(self):
+        return {
+            "drive_id": self.drive_id,
+            "drive_name": self.drive_name,
+            "total_members": self.total_members,
+            "org_unit_id": self.org_unit_id,
+            "org_unit_name": self.org_unit_name,
+            "query_date": self.query_date,
+            "total_uw_owners": self.total_uw_owners,
+            "size": self.size,
+            "file_count": self.file_count,
+            "members": [m.json_data() for m in self.members],
+        }
+
+    def __str__(self):
+        return json.dumps(self.json_data())
+
+
+class DriveQuotaResult(models.Model):
+    """
+    Outcome of setting one drive's quota in a batch.
+    """
+    drive_id = models.SlugField(max_length=19)
+    quota = models.PositiveIntegerField()
+
+    def __init__(self, *args, **kwargs):
+        self.response = None
+        self.error = None
+        super().__init__(*args, **kwargs)
+
+    @property
+    def succeeded(self):
+        return self.error is None
+
+    def json_data(self):
+        return {
+            "drive_id": self.drive_id,
+            "quota": self.quota,
+            "response": self.response,
+            "error": str(self.error) if self.error else None,
+        }
+
+    def __str__(self):
+        return json.dumps(self.json_data())
+
+
 class Quota:
     """
     Quota translation class.
@@ -0,0 +1,205 @@
+# Copyright 2025 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Client-side rate limiting for MSCA requests, which share the APIM
+subscription's rate quota.
+
+Every MSCA request takes a token from the budget of its class, READ,
+DELEGATE_WRITE or QUOTA_WRITE, each limited to
+RESTCLIENTS_MSCA_RATE_LIMIT_<CLASS> requests per second in bursts of up
+to RESTCLIENTS_MSCA_RATE_LIMIT_<CLASS>_BURST, and unlimited if not set.
+With RESTCLIENTS_MSCA_RATE_LIMIT_DIR set the budgets are kept in files
+in that directory, so are shared by every process on the host using it.
+External resource requests, e.g., blob storage downloads, are exempt.
+"""
+
+import os
+import struct
+import threading
+import time
+from urllib.parse import urlsplit
+from commonconf import settings
+from restclients_core.exceptions import ImproperlyConfigured
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+READ = "read"
+DELEGATE_WRITE = "delegate_write"
+QUOTA_WRITE = "quota_write"
+
+READ_METHODS = frozenset(("GET", "HEAD", "OPTIONS"))
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket allowing rate requests per second on average,
+    in bursts of up to burst requests.
+    """
+    def __init__(self, rate, burst=None):
+        if rate <= 0:
+            raise ValueError("rate must be greater than 0")
+
+        self.rate = float(rate)
+        self.burst = float(burst if burst is not None else max(rate, 1))
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens=1):
+        """
+        Block until tokens are available, returning seconds waited
+        """
+        delay = self.reserve(tokens)
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    def reserve(self, tokens=1):
+        """
+        Take tokens, returning the seconds to wait before using them
+        """
+        with self._lock:
+            self._tokens, self._updated, delay = self._take(
+                self._tokens, self._updated, time.monotonic(), tokens)
+            return delay
+
+    def _take(self, available, updated, now, tokens):
+        """
+        Return the tokens left, when, and the seconds until tokens
+        taken from available tokens last updated at updated are usable
+        """
+        available = min(self.burst, available + (now - updated) * self.rate)
+        available -= tokens
+        return available, now, max(-available / self.rate, 0.0)
+
+
+class FileTokenBucket(TokenBucket):
+    """
+    Token bucket kept in a file under an exclusive flock, shared by the
+    processes using the same path.
+
+    flock locks belong to the open file description, which a forked child
+    shares with its parent, so a child reopens the file before its first
+    reserve.
+    """
+    STATE = struct.Struct("=dd")
+
+    def __init__(self, path, rate, burst=None):
+        if fcntl is None:
+            raise ImproperlyConfigured(
+                "FileTokenBucket requires fcntl file locking")
+
+        super().__init__(rate, burst=burst)
+        self.path = path
+        self._open()
+
+    def _open(self):
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        self._pid = os.getpid()
+
+    def _after_fork(self):
+        """
+        Reopen the file, and replace the thread lock in case a thread
+        of the parent held it when forking
+        """
+        if self._fd is not None:
+            os.close(self._fd)
+        self._lock = threading.Lock()
+        self._open()
+
+    def reserve(self, tokens=1):
+        if self._pid != os.getpid():
+            self._after_fork()
+
+        # flock doesn't exclude threads sharing the file descriptor
+        with self._lock:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                # wall clock time, as it's shared across processes
+                now = time.time()
+                state = os.pread(self._fd, self.STATE.size, 0)
+                if len(state) == self.STATE.size:
+                    available, updated = self.STATE.unpack(state)
+                else:
+                    available, updated = self.burst, now
+
+                available, updated, delay = self._take(
+                    available, min(updated, now), now, tokens)
+                os.pwrite(self._fd, self.STATE.pack(available, updated), 0)
+                return delay
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+def request_class(method, url):
+    """
+    Return the rate limit class of a request, or None for external
+    resource requests
+    """
+    parts = urlsplit(url)
+    if parts.netloc:
+        return None
+    if method in READ_METHODS:
+        return READ
+    if parts.path.startswith("/google/"):
+        return QUOTA_WRITE
+    return DELEGATE_WRITE
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(limit_class):
+    """
+    Return the TokenBucket for limit_class configured by settings, or
+    None if it is unlimited
+    """
+    name = "RESTCLIENTS_MSCA_RATE_LIMIT_{}".format(limit_class.upper())
+    rate = getattr(settings, name, None)
+    if not rate:
+        return None
+
+    burst = getattr(settings, name + "_BURST", None)
+    directory = getattr(settings, 'RESTCLIENTS_MSCA_RATE_LIMIT_DIR', None)
+    key = (limit_class, float(rate), burst, directory)
+    with _limiters_lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            burst = None if burst is None else float(burst)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+                limiter = FileTokenBucket(
+                    os.path.join(directory, "{}.bucket".format(limit_class)),
+                    float(rate), burst=burst)
+            else:
+                limiter = TokenBucket(float(rate), burst=burst)
+            _limiters[key] = limiter
+        return limiter
+
+
+def reserve(method, url):
+    """
+    Take a token for a request, returning seconds to wait before sending
+    """
+    limit_class = request_class(method, url)
+    limiter = get_limiter(limit_class) if limit_class else None
+    return limiter.reserve() if limiter else 0.0
+
+
+def reset_limiters():
+    with _limiters_lock:
+        for limiter in _limiters.values():
+            if isinstance(limiter, FileTokenBucket):
+                limiter.close()
+        _limiters.clear()
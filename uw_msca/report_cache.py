@@ -0,0 +1,157 @@
+# Copyright 2025 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+On-disk cache of the PPLAT drive state report.
+
+The report only changes once a day, so the csv rows of a downloaded report
+are pickled into a file keyed by the report's query_date and reused until
+the (UTC) day of that query_date has passed, or the configured TTL passes,
+whichever comes first.  The cache is enabled by setting
+RESTCLIENTS_MSCA_DRIVE_REPORT_CACHE_DIR.
+
+Cache files are unpickled when loaded, so the cache directory must not be
+writable by any other user: anyone who can write a cache file there can
+run code in this process.
+"""
+
+import glob
+import logging
+import os
+import pickle
+import re
+import tempfile
+import time
+from datetime import date, datetime, timezone
+from commonconf import settings
+
+
+logger = logging.getLogger(__name__)
+
+CACHE_FILE_PREFIX = "drive_state_report-"
+CACHE_FILE_SUFFIX = ".pickle"
+
+
+class DriveReportCache:
+    def __init__(self, directory, ttl=3600, max_size=1024 ** 3):
+        """
+        Args:
+            directory: path the cache files are written to
+            ttl: upper bound in seconds on how long a cached report is
+                served after being written
+            max_size: upper bound in bytes on the total size of cache files
+        """
+        self.directory = directory
+        self.ttl = ttl
+        self.max_size = max_size
+
+    @classmethod
+    def from_settings(cls):
+        """
+        Return a DriveReportCache configured by RESTCLIENTS_MSCA_* settings,
+        or None if the cache is not enabled.
+        """
+        directory = getattr(
+            settings, 'RESTCLIENTS_MSCA_DRIVE_REPORT_CACHE_DIR', None)
+        if not directory:
+            return None
+
+        return cls(
+            directory,
+            ttl=int(getattr(
+                settings, 'RESTCLIENTS_MSCA_DRIVE_REPORT_CACHE_TTL', 3600)),
+            max_size=int(getattr(
+                settings, 'RESTCLIENTS_MSCA_DRIVE_REPORT_CACHE_MAX_SIZE',
+                1024 ** 3)))
+
+    def load(self):
+        """
+        Return the rows of the newest cached report if its query_date is
+        still the current day and it is within the TTL, or None.
+        """
+        paths = self._cache_files()
+        if not paths:
+            return None
+
+        path = paths[-1]
+        query_date = self._query_date(path)
+        if query_date is None or _utcnow().date() > query_date:
+            return None
+
+        try:
+            if time.time() - os.path.getmtime(path) > self.ttl:
+                return None
+
+            with open(path, "rb") as f:
+                return pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError) as ex:
+            logger.error(f"drive report cache: cannot read {path}: {ex}")
+            return None
+
+    def save(self, rows):
+        """
+        Cache report rows, header row first, keyed by their query_date.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, "{}{}{}".format(
+            CACHE_FILE_PREFIX, self._key(rows), CACHE_FILE_SUFFIX))
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(rows, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except OSError as ex:
+            logger.error(f"drive report cache: cannot write {path}: {ex}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+
+        self._prune()
+
+    def clear(self):
+        for path in self._cache_files():
+            os.remove(path)
+
+    def _key(self, rows):
+        try:
+            query_date = rows[1][rows[0].index("query_date")]
+        except (IndexError, ValueError):
+            query_date = "unknown"
+
+        return re.sub(r"[^\w.-]", "_", query_date)
+
+    def _query_date(self, path):
+        """
+        Return the date of the query_date the cache file is keyed by, or None
+        """
+        key = os.path.basename(path)[len(CACHE_FILE_PREFIX):]
+        try:
+            return date.fromisoformat(key[:10])
+        except ValueError:
+            return None
+
+    def _cache_files(self):
+        """
+        Return cache file paths, oldest first
+        """
+        paths = glob.glob(os.path.join(
+            glob.escape(self.directory),
+            "{}*{}".format(CACHE_FILE_PREFIX, CACHE_FILE_SUFFIX)))
+        return sorted(paths, key=os.path.getmtime)
+
+    def _prune(self):
+        """
+        Remove the oldest cache files until within max_size
+        """
+        paths = self._cache_files()
+        total = sum(os.path.getsize(path) for path in paths)
+        while paths and total > self.max_size:
+            path = paths.pop(0)
+            total -= os.path.getsize(path)
+            logger.info(f"drive report cache: removing {path}")
+            os.remove(path)
+
+
+def _utcnow():
+    return datetime.now(timezone.utc)
@@ -0,0 +1,339 @@
+# Copyright 2025 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Retries with jittered exponential backoff and per-endpoint circuit
+breakers for MSCA requests.
+
+Throttled (429) requests are retried whatever their method, as APIM has
+not passed them on.  Other failures, e.g., 5xx's from Azure Function cold
+starts and connection errors, are only retried for idempotent methods.
+A Retry-After response header takes the place of the backoff delay.
+
+After RESTCLIENTS_MSCA_CIRCUIT_FAILURES consecutive failures of an
+endpoint its circuit opens, and requests to it raise CircuitOpen without
+being sent for RESTCLIENTS_MSCA_CIRCUIT_RESET seconds.  A single trial
+request is then let through, closing the circuit if it succeeds.
+
+Each attempt is rate limited by uw_msca.ratelimit.
+"""
+
+import asyncio
+import logging
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from commonconf import settings
+from restclients_core.exceptions import DataFailureException
+from urllib3.exceptions import HTTPError
+from uw_msca import ratelimit
+from uw_msca.metrics import endpoint_template
+
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENT_METHODS = frozenset(("GET", "HEAD", "PUT", "DELETE", "OPTIONS"))
+
+
+class CircuitOpen(DataFailureException):
+    """
+    Raised in place of requests to an endpoint whose circuit is open
+    """
+    def __init__(self, url, endpoint, retry_in):
+        super().__init__(url, 503, "Circuit open for {}, retry in {:.1f}s"
+                         .format(endpoint, retry_in))
+        self.endpoint = endpoint
+        self.retry_in = retry_in
+
+
+class RetryPolicy:
+    """
+    Which requests to retry, and how long to wait before doing so
+    """
+    def __init__(self, attempts=3, backoff=0.5, max_backoff=30,
+                 statuses=(429, 500, 502, 503, 504)):
+        """
+        Args:
+            attempts: requests made before giving up, 1 to not retry
+            backoff: seconds the first retry waits at most, doubling with
+                each further retry
+            max_backoff: most seconds to wait, Retry-After included
+            statuses: response statuses to retry
+        """
+        self.attempts = max(int(attempts), 1)
+        self.backoff = float(backoff)
+        self.max_backoff = float(max_backoff)
+        self.statuses = frozenset(statuses)
+
+    @classmethod
+    def from_settings(cls):
+        statuses = getattr(
+            settings, 'RESTCLIENTS_MSCA_RETRY_STATUSES', None)
+        if isinstance(statuses, str):
+            statuses = [int(s) for s in statuses.split(",") if s.strip()]
+
+        return cls(
+            attempts=getattr(settings, 'RESTCLIENTS_MSCA_RETRY_ATTEMPTS', 3),
+            backoff=getattr(settings, 'RESTCLIENTS_MSCA_RETRY_BACKOFF', 0.5),
+            max_backoff=getattr(
+                settings, 'RESTCLIENTS_MSCA_RETRY_MAX_BACKOFF', 30),
+            **({} if statuses is None else {"statuses": statuses}))
+
+    def should_retry(self, method, status, attempt):
+        """
+        Return whether a request that got status, 0 for a connection
+        error, on its attempt'th try should be retried
+        """
+        if attempt >= self.attempts:
+            return False
+        if status == 429:
+            return status in self.statuses
+        return method in IDEMPOTENT_METHODS and (
+            status == 0 or status in self.statuses)
+
+    def delay(self, attempt, response=None):
+        """
+        Return seconds to wait before retrying after attempt, honoring
+        response's Retry-After header
+        """
+        retry_after = _retry_after(response)
+        if retry_after is not None:
+            return min(retry_after, self.max_backoff)
+
+        # "full jitter" spreads retries of concurrent callers apart
+        return random.uniform(
+            0, min(self.max_backoff, self.backoff * 2 ** (attempt - 1)))
+
+
+class CircuitBreaker:
+    """
+    Thread-safe consecutive failure counting circuit breaker
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, endpoint, failures=5, reset=30):
+        self.endpoint = endpoint
+        self.failure_threshold = failures
+        self.reset_timeout = reset
+        self.state = self.CLOSED
+        self.failures = 0
+        self._opened = 0.0
+        self._trial_started = 0.0
+        self._lock = threading.Lock()
+
+    def before_request(self, url):
+        """
+        Raise CircuitOpen unless a request may be sent
+        """
+        with self._lock:
+            if self.state == self.CLOSED:
+                return
+
+            now = time.monotonic()
+            if self.state == self.HALF_OPEN:
+                # the trial request may never have been recorded
+                retry_in = self._trial_started + self.reset_timeout - now
+            else:
+                retry_in = self._opened + self.reset_timeout - now
+
+            if retry_in <= 0:
+                # let a single trial request through
+                self.state = self.HALF_OPEN
+                self._trial_started = now
+                return
+
+            raise CircuitOpen(url, self.endpoint, retry_in)
+
+    def abandon(self):
+        """
+        Forget a request that ended without a result, e.g., was
+        cancelled, so that another trial request may be let through
+        """
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self.state = self.OPEN
+
+    def record(self, failed):
+        with self._lock:
+            if not failed:
+                self.state = self.CLOSED
+                self.failures = 0
+                return
+
+            self.failures += 1
+            if (self.state == self.HALF_OPEN or
+                    self.failures >= self.failure_threshold):
+                if self.state != self.OPEN:
+                    logger.warning("circuit open for {} after {} failures"
+                                   .format(self.endpoint, self.failures))
+                self.state = self.OPEN
+                self._opened = time.monotonic()
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(url):
+    """
+    Return the CircuitBreaker of url's endpoint, or None if circuit
+    breaking is disabled
+    """
+    failures = int(getattr(settings, 'RESTCLIENTS_MSCA_CIRCUIT_FAILURES', 5))
+    if failures <= 0:
+        return None
+
+    endpoint = endpoint_template(url)
+    with _breakers_lock:
+        breaker = _breakers.get(endpoint)
+        if breaker is None:
+            breaker = _breakers[endpoint] = CircuitBreaker(endpoint)
+        breaker.failure_threshold = failures
+        breaker.reset_timeout = float(getattr(
+            settings, 'RESTCLIENTS_MSCA_CIRCUIT_RESET', 30))
+        return breaker
+
+
+def reset_breakers():
+    with _breakers_lock:
+        _breakers.clear()
+
+
+def send(method, url, load, *args, **kwargs):
+    """
+    Return the response of load(url, *args, **kwargs) and the number of
+    retries made, retrying per RetryPolicy.from_settings()
+    """
+    policy = RetryPolicy.from_settings()
+    breaker = get_breaker(url)
+    attempt = 0
+    while True:
+        attempt += 1
+        if breaker:
+            breaker.before_request(url)
+
+        try:
+            delay = ratelimit.reserve(method, url)
+            if delay > 0:
+                time.sleep(delay)
+
+            response, error, status = _attempt(load, url, args, kwargs)
+        except BaseException as ex:
+            _record_exception(breaker, ex)
+            raise
+
+        if breaker:
+            breaker.record(_is_failure(status))
+
+        if not policy.should_retry(method, status, attempt):
+            if error is not None:
+                raise error
+            return response, attempt - 1
+
+        delay = policy.delay(attempt, response)
+        _log_retry(method, url, status, attempt, delay)
+        _release(response)
+        time.sleep(delay)
+
+
+async def send_async(method, url, request):
+    """
+    Return the response of await request() and the number of retries
+    made, retrying per RetryPolicy.from_settings()
+    """
+    policy = RetryPolicy.from_settings()
+    breaker = get_breaker(url)
+    attempt = 0
+    while True:
+        attempt += 1
+        if breaker:
+            breaker.before_request(url)
+
+        try:
+            delay = ratelimit.reserve(method, url)
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            response = await request()
+            error, status = None, response.status
+        except DataFailureException as ex:
+            response, error, status = None, ex, ex.status
+        except BaseException as ex:
+            _record_exception(breaker, ex)
+            raise
+
+        if breaker:
+            breaker.record(_is_failure(status))
+
+        if not policy.should_retry(method, status, attempt):
+            if error is not None:
+                raise error
+            return response, attempt - 1
+
+        delay = policy.delay(attempt, response)
+        _log_retry(method, url, status, attempt, delay)
+        await asyncio.sleep(delay)
+
+
+def _attempt(load, url, args, kwargs):
+    """
+    Return response, exception raised and status of a request
+    """
+    try:
+        response = load(url, *args, **kwargs)
+        return response, None, response.status
+    except DataFailureException as ex:
+        return None, ex, ex.status
+    except HTTPError as ex:
+        return None, ex, 0
+
+
+def _record_exception(breaker, ex):
+    """
+    Record a request that raised ex, e.g., an ssl.SSLError, as failed,
+    or as abandoned if it was cancelled or interrupted
+    """
+    if breaker is None:
+        return
+    if isinstance(ex, Exception):
+        breaker.record(True)
+    else:
+        breaker.abandon()
+
+
+def _is_failure(status):
+    return status == 0 or status == 429 or status >= 500
+
+
+def _retry_after(response):
+    headers = getattr(response, "headers", None) or {}
+    value = headers.get("Retry-After", headers.get("retry-after"))
+    if value is None:
+        return None
+
+    try:
+        return max(float(value), 0)
+    except ValueError:
+        pass
+
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max((when - datetime.now(timezone.utc)).total_seconds(), 0)
+
+
+def _release(response):
+    if hasattr(response, "release_conn"):
+        response.release_conn()
+
+
+def _log_retry(method, url, status, attempt, delay):
+    logger.warning("{} {} ==status==> {}, retry {} in {:.2f}s".format(
+        method, url, status, attempt, delay))
@@ -12,28 +12,40 @@ is located in.
 """
 
 import csv
-import io
 import json
 import logging
 from urllib.parse import urlencode
 
+from commonconf import settings
 from uw_msca import (
     DAO,
+    map_concurrently,
     url_base,
     get_resource,
     get_external_resource,
     put_resource,
+    stream_external_resource,
+    iter_decoded_lines,
 )
 
 from uw_msca.models import (
+    DriveQuotaResult,
+    GoogleDrive,
     GoogleDriveState,
+    GoogleDriveStateRecord,
     Quota,
 )
+from uw_msca.cache import cached_lookup
+from uw_msca.drive_state_parser import parse_drive_states
+from uw_msca.ratelimit import TokenBucket
+from uw_msca.report_cache import DriveReportCache
 
 
+@cached_lookup('RESTCLIENTS_MSCA_LOOKUP_CACHE_TTL')
 def get_default_org_unit():
     """
-    Return the default/subsidized Org Unit for Shared Drives.
+    Return the default/subsidized Org Unit for Shared Drives, cached for
+    RESTCLIENTS_MSCA_LOOKUP_CACHE_TTL seconds.
     """
     org_unit_resp = get_resource(url=_get_default_org_unit_url())
     j = json.loads(org_unit_resp)
@@ -45,36 +57,169 @@ def get_default_quota():
     return Quota.to_int(default_quota)
 
 
-def get_google_drive_states():
+def get_google_drive_states(record_class=GoogleDriveState, processes=None):
     """
     Return list of GoogleDriveState's from report generated by PPLAT.
+
+    The report rows are served from the DriveReportCache when
+    RESTCLIENTS_MSCA_DRIVE_REPORT_CACHE_DIR is set.
+
+    Args:
+        record_class: GoogleDriveState, or GoogleDriveStateRecord for a
+            compact representation suited to holding the whole report
+        processes: parse the downloaded report with a pool of this many
+            processes, worthwhile for reports of millions of rows
+            and GoogleDriveStateRecord's.  Not used when the report
+            cache is enabled.
+    """
+    cache = DriveReportCache.from_settings()
+    if cache is None:
+        if processes and processes > 1:
+            return parse_drive_states(
+                get_external_resource(_get_drive_state_report_url()),
+                record_class, processes)
+
+        return list(iter_google_drive_states(record_class=record_class))
+
+    rows = cache.load()
+    if rows is None:
+        rows = list(_iter_drive_state_rows())
+        cache.save(rows)
+
+    return list(_decode_drive_state_rows(iter(rows), record_class))
+
+
+def iter_google_drive_states(record_class=GoogleDriveState):
+    """
+    Yield GoogleDriveState's from report generated by PPLAT one at a time.
+
+    The report is read from the SAS url in chunks so memory use stays flat
+    regardless of report size.
+    """
+    return _decode_drive_state_rows(_iter_drive_state_rows(), record_class)
+
+
+def get_google_drives(drive_states=None):
+    """
+    Return dict of drive_id to GoogleDrive, aggregating the per-member rows
+    of the PPLAT report in a single pass.
+
+    Args:
+        drive_states: optional iterable of GoogleDriveState's, the report
+            is streamed from PPLAT when not provided
+    """
+    if drive_states is None:
+        drive_states = iter_google_drive_states()
+
+    drives = {}
+    for drive_state in drive_states:
+        try:
+            drives[drive_state.drive_id].add_member(drive_state)
+        except KeyError:
+            drives[drive_state.drive_id] = GoogleDrive.from_drive_state(
+                drive_state)
+
+    return drives
+
+
+def _decode_drive_state_rows(rows, record_class):
+    decode = record_class.csv_decoder(next(rows))
+    for row in rows:
+        if row:
+            yield decode(row)
+
+
+def _iter_drive_state_rows():
+    """
+    Yield the drive state report as csv.reader rows, header row first
+    """
+    yield from _drive_state_rows(iter_decoded_lines(
+        stream_external_resource(_get_drive_state_report_url())))
+
+
+def _get_drive_state_report_url():
+    """
+    Return the SAS url of the current drive state report
     """
     drive_state_reports_resp = get_resource(url=_get_drivestate_url())
-    drive_state_reports_url = json.loads(drive_state_reports_resp)["sasKey"]
-    report_resp: bytes = get_external_resource(drive_state_reports_url)
+    return json.loads(drive_state_reports_resp)["sasKey"]
+
 
-    # wrap encoded bytes such that they can be iterated over per-line
-    filelike = io.TextIOWrapper(io.BytesIO(report_resp))
+def _drive_state_rows(lines):
+    """
+    Yield csv.reader rows of report lines, header row first
+    """
+    rows = csv.reader(lines)
+    fieldnames = next(rows, [])
+    _check_drive_state_fields(fieldnames)
 
-    records = csv.DictReader(filelike)
-    if not set(records.fieldnames).issuperset(
-        GoogleDriveState.EXPECTED_CSV_FIELDS
-    ):
+    yield fieldnames
+    yield from rows
+
+
+def _check_drive_state_fields(fieldnames):
+    if not set(fieldnames).issuperset(GoogleDriveState.EXPECTED_CSV_FIELDS):
         missing = [
             X
             for X in GoogleDriveState.EXPECTED_CSV_FIELDS
-            if X not in records.fieldnames
+            if X not in fieldnames
         ]
         logging.error(
             f"Missing expected fields from {_get_drivestate_url()}: {missing}"
         )
 
-    result = []
 
-    for record in records:
-        result.append(GoogleDriveState.from_csv(record))
+def plan_drive_quotas(policy, drive_states=None):
+    """
+    Return dict of drive_id to quota for only those drives whose current
+    Org Unit quota differs from the one policy wants, suitable for
+    set_drive_quotas.
+
+    Args:
+        policy: dict of drive_id to integer quota, or a callable given a
+            drive's first GoogleDriveState returning its integer quota,
+            None leaving the drive as is
+        drive_states: optional iterable of GoogleDriveState's, the report
+            is streamed from PPLAT when not provided
+    """
+    if drive_states is None:
+        drive_states = iter_google_drive_states(
+            record_class=GoogleDriveStateRecord)
+
+    if callable(policy):
+        desired_quota = policy
+    else:
+        def desired_quota(drive_state):
+            return policy.get(drive_state.drive_id)
+
+    # few distinct org units, so convert each name once
+    current_quotas = {}
+    seen = set()
+    changes = {}
+    for drive_state in drive_states:
+        drive_id = drive_state.drive_id
+        if drive_id in seen:
+            continue
+        seen.add(drive_id)
+
+        quota = desired_quota(drive_state)
+        if quota is None:
+            continue
+
+        org_unit_name = drive_state.org_unit_name
+        try:
+            current = current_quotas[org_unit_name]
+        except KeyError:
+            try:
+                current = Quota.to_int(org_unit_name)
+            except ValueError:
+                current = None
+            current_quotas[org_unit_name] = current
 
-    return result
+        if current != quota:
+            changes[drive_id] = quota
+
+    return changes
 
 
 def set_drive_quota(quota: int, drive_id: str):
@@ -98,7 +243,48 @@ def set_drive_quota(quota: int, drive_id: str):
         url=_set_quota_url(drive_id),
         body=json.dumps(data)
     )
+    return _set_quota_response(resp_data)
+
+
+def set_drive_quotas(assignments, max_workers=None, rate_limit=None):
+    """
+    Update many Google Drives to have the specified quotas, concurrently.
+
+    Args:
+        assignments: dict of drive_id to integer quota in units of GB
+        max_workers: concurrent requests, defaults to
+            RESTCLIENTS_MSCA_MAX_WORKERS
+        rate_limit: maximum requests per second, defaults to
+            RESTCLIENTS_MSCA_QUOTA_RATE_LIMIT, unlimited if not set
+
+    Returns:
+        dict of drive_id to DriveQuotaResult
+    """
+    if rate_limit is None:
+        rate_limit = getattr(
+            settings, 'RESTCLIENTS_MSCA_QUOTA_RATE_LIMIT', None)
+
+    bucket = TokenBucket(float(rate_limit)) if rate_limit else None
+
+    def set_quota(drive_id):
+        if bucket:
+            bucket.acquire()
+        return set_drive_quota(assignments[drive_id], drive_id)
+
+    responses, errors = map_concurrently(
+        set_quota, assignments.keys(), max_workers=max_workers)
+
+    results = {}
+    for drive_id, quota in assignments.items():
+        result = DriveQuotaResult(drive_id=drive_id, quota=quota)
+        result.response = responses.get(drive_id)
+        result.error = errors.get(drive_id)
+        results[drive_id] = result
+
+    return results
+
 
+def _set_quota_response(resp_data):
     try:
         # Mike asked for a JSON payload
         return json.loads(resp_data)
@@ -0,0 +1,91 @@
+# Copyright 2025 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Local HTTP server standing in for blob storage in tests.
+"""
+
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class BlobHandler(BaseHTTPRequestHandler):
+    """
+    Serves server.blobs with Range and If-Match support, cutting off the
+    next server.truncate responses half way through their body
+    """
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.server.requests.append((self.path, dict(self.headers)))
+        body = self.server.blobs.get(self.path)
+        if body is None:
+            return self._respond(404, b"")
+
+        etag = '"{}"'.format(hash(body) & 0xffffffff)
+        if_match = self.headers.get("If-Match")
+        if if_match and if_match != etag:
+            return self._respond(412, b"", {"ETag": etag})
+
+        match = re.match(r"bytes=(\d+)-(\d*)", self.headers.get("Range", ""))
+        if match and self.server.ranges:
+            start = int(match.group(1))
+            if start >= len(body):
+                return self._respond(416, b"", {
+                    "ETag": etag,
+                    "Content-Range": "bytes */{}".format(len(body))})
+
+            end = min(int(match.group(2) or len(body) - 1), len(body) - 1)
+            return self._respond(206, body[start:end + 1], {
+                "ETag": etag,
+                "Content-Range": "bytes {}-{}/{}".format(
+                    start, end, len(body))})
+
+        self._respond(200, body, {"ETag": etag})
+
+    def _respond(self, status, body, headers={}):
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+
+        with self.server.lock:
+            truncate = self.server.truncate > 0 and len(body) > 1
+            if truncate:
+                self.server.truncate -= 1
+
+        if truncate:
+            self.wfile.write(body[:len(body) // 2])
+            self.wfile.flush()
+            self.close_connection = True
+        else:
+            self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class BlobServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, blobs, ranges=True, truncate=0):
+        super().__init__(("127.0.0.1", 0), BlobHandler)
+        self.blobs = blobs
+        self.ranges = ranges
+        self.truncate = truncate
+        self.requests = []
+        self.lock = threading.Lock()
+        self.thread = threading.Thread(target=self.serve_forever, daemon=True)
+
+    def url(self, path):
+        return "http://127.0.0.1:{}{}".format(self.server_port, path)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self.shutdown()
+        self.server_close()
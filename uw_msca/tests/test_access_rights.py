@@ -2,12 +2,47 @@
 # SPDX-License-Identifier: Apache-2.0
 
 from unittest import TestCase
+from unittest.mock import patch
+from commonconf import override_settings
 from uw_msca.access_rights import get_access_rights
+from uw_msca.models import AccessRight, AccessRightRecord
+from uw_msca.cache import invalidate_caches
 from uw_msca.util import fdao_msca_override
+import uw_msca.access_rights
 
 
 @fdao_msca_override
 class AccessRightsTest(TestCase):
+    def setUp(self):
+        invalidate_caches()
+
     def test_get_access_rights(self):
         access_rights = get_access_rights()
         self.assertEqual(len(access_rights), 4)
+
+    def test_record_class(self):
+        records = get_access_rights(record_class=AccessRightRecord)
+        self.assertIsInstance(records[0], AccessRightRecord)
+        self.assertEqual(
+            [r.json_data() for r in records],
+            [r.json_data() for r in get_access_rights()])
+        self.assertIsInstance(get_access_rights()[0], AccessRight)
+
+    def test_get_access_rights_cached(self):
+        stats = get_access_rights.cache.stats()
+        with patch.object(uw_msca.access_rights, 'get_resource',
+                          wraps=uw_msca.access_rights.get_resource) as mock:
+            get_access_rights()
+            access_rights = get_access_rights()
+            self.assertEqual(mock.call_count, 1)
+            self.assertEqual(len(access_rights), 4)
+            self.assertEqual(get_access_rights.cache.stats()['hits'],
+                             stats['hits'] + 1)
+
+            get_access_rights.cache.invalidate()
+            get_access_rights()
+            self.assertEqual(mock.call_count, 2)
+
+            with override_settings(RESTCLIENTS_MSCA_LOOKUP_CACHE_TTL=0):
+                get_access_rights()
+            self.assertEqual(mock.call_count, 3)
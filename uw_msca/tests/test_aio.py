@@ -0,0 +1,147 @@
+# Copyright 2025 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+import ssl
+from unittest import IsolatedAsyncioTestCase, TestCase
+from unittest.mock import AsyncMock, patch
+from commonconf import override_settings
+from restclients_core.exceptions import DataFailureException
+from uw_msca import DAO
+from uw_msca.aio import (
+    MockTransport, close_transport, get_transport, _ssl_context)
+from uw_msca.access_rights import (
+    get_access_rights as sync_get_access_rights)
+from uw_msca.aio.access_rights import get_access_rights
+from uw_msca.aio.delegate import (
+    get_delegates, get_delegates_bulk, set_delegate, remove_delegate)
+from uw_msca.aio.shared_drive import (
+    get_default_org_unit, get_default_quota, get_google_drive_states,
+    set_drive_quota)
+from uw_msca.cache import invalidate_caches
+from uw_msca.aio.validate_user import validate_user
+from uw_msca.models import Delegate, GoogleDriveState
+from uw_msca.util import fdao_msca_override
+
+
+@fdao_msca_override
+class AsyncTest(IsolatedAsyncioTestCase):
+    def setUp(self):
+        invalidate_caches()
+
+    async def asyncTearDown(self):
+        await close_transport()
+
+    async def test_transport(self):
+        self.assertIsInstance(get_transport(), MockTransport)
+        self.assertIs(get_transport(), get_transport())
+
+    async def test_live_transport(self):
+        await close_transport()
+        with override_settings(RESTCLIENTS_MSCA_DAO_CLASS=(
+                "restclients.dao_implementation.msca.Live")), \
+                patch("uw_msca.aio.LiveTransport") as live:
+            live.return_value.close = AsyncMock()
+            self.assertIs(get_transport(), live.return_value)
+            await close_transport()
+        live.assert_called_once_with(DAO)
+
+    async def test_get_delegates(self):
+        delegates = await get_delegates('javerage')
+        self.assertEqual(len(delegates), 2)
+        self.assertIsInstance(delegates[0], Delegate)
+        self.assertEqual(delegates[0].delegate, 'jstaff@uw.edu')
+
+        delegates, errors = await get_delegates_bulk(['bill', 'nobody'])
+        self.assertEqual(len(delegates['bill']), 1)
+        self.assertEqual(errors['nobody'].status, 404)
+
+    async def test_not_found(self):
+        with self.assertRaises(DataFailureException) as cm:
+            await get_delegates('nobody')
+        self.assertEqual(cm.exception.status, 404)
+
+    async def test_set_remove_delegate(self):
+        delegates = await set_delegate('jstaff', 'javerage', 'SendAs')
+        self.assertEqual(delegates[0].user, 'jstaff')
+        self.assertEqual(delegates[0].access_right, 'SendAs')
+
+        delegates = await remove_delegate('jstaff', 'javerage', 'SendAs')
+        self.assertIsInstance(delegates, list)
+
+    async def test_validate_user(self):
+        self.assertTrue((await validate_user('javerage')).valid)
+        self.assertFalse((await validate_user('bill')).valid)
+
+    async def test_get_access_rights(self):
+        self.assertEqual(len(await get_access_rights()), 4)
+
+    async def test_lookups_cached(self):
+        with patch('uw_msca.aio.access_rights.get_resource') as mock_rights, \
+                patch('uw_msca.aio.shared_drive.get_resource') as mock_ou:
+            # served from the lookups the synchronous functions cached
+            access_rights = sync_get_access_rights()
+            self.assertIs(await get_access_rights(), access_rights)
+            mock_rights.assert_not_called()
+
+            get_access_rights.cache.invalidate()
+            mock_rights.return_value = '{"value": []}'
+            self.assertEqual(await get_access_rights(), [])
+            self.assertEqual(sync_get_access_rights(), [])
+            self.assertEqual(mock_rights.call_count, 1)
+
+            mock_ou.return_value = '{"ou": "100GB"}'
+            self.assertEqual(await get_default_org_unit(), "100GB")
+            self.assertEqual(await get_default_quota(), 100)
+            self.assertEqual(mock_ou.call_count, 1)
+
+            with override_settings(RESTCLIENTS_MSCA_LOOKUP_CACHE_TTL=0):
+                await get_default_org_unit()
+            self.assertEqual(mock_ou.call_count, 2)
+
+    async def test_shared_drive(self):
+        self.assertEqual(await get_default_quota(), 100)
+
+        result = await set_drive_quota(3000, "0AIdwn8Py42DEADBEEF")
+        self.assertEqual(result, {
+            "message": "Drive '0AIdwn8Py42DEADBEEF' successfully moved to "
+                       "3000GB"})
+
+        with patch.object(MockTransport, 'external_request',
+                          return_value=DAO.getURL(
+                              '/google/report_response_fixture')):
+            gdrive_states = await get_google_drive_states()
+
+        self.assertEqual(len(gdrive_states), 3)
+        self.assertIsInstance(gdrive_states[0], GoogleDriveState)
+        self.assertEqual(gdrive_states[2].size, 974)
+
+
+class SSLContextTest(TestCase):
+    @override_settings(RESTCLIENTS_MSCA_HOST="http://localhost")
+    def test_http(self):
+        self.assertIsNone(_ssl_context(DAO))
+
+    @override_settings(RESTCLIENTS_MSCA_HOST="https://localhost",
+                       RESTCLIENTS_CA_BUNDLE="/tmp/ca.pem",
+                       RESTCLIENTS_MSCA_CERT_FILE="/tmp/cert.pem",
+                       RESTCLIENTS_MSCA_KEY_FILE="/tmp/key.pem")
+    def test_verified(self):
+        with patch("uw_msca.aio.ssl.create_default_context") as create:
+            context = _ssl_context(DAO)
+        self.assertIs(context, create.return_value)
+        create.assert_called_once_with(cafile="/tmp/ca.pem")
+        context.load_cert_chain.assert_called_once_with(
+            "/tmp/cert.pem", "/tmp/key.pem")
+
+    @override_settings(RESTCLIENTS_MSCA_HOST="https://localhost",
+                       RESTCLIENTS_MSCA_VERIFY_HTTPS=False)
+    def test_unverified(self):
+        context = _ssl_context(DAO)
+        self.assertEqual(context.verify_mode, ssl.CERT_NONE)
+        self.assertFalse(context.check_hostname)
+
+    def test_ssl_context(self):
+        context = ssl.create_default_context()
+        with override_settings(RESTCLIENTS_MSCA_HOST="https://localhost",
+                               RESTCLIENTS_MSCA_SSL_CONTEXT=context):
+            self.assertIs(_ssl_context(DAO), context)
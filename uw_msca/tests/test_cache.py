@@ -0,0 +1,32 @@
+# Copyright 2025 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+from unittest import TestCase
+from unittest.mock import patch
+from uw_msca.cache import TTLCache, CACHES
+
+
+class TTLCacheTest(TestCase):
+    def tearDown(self):
+        CACHES.pop("test", None)
+
+    def test_ttl(self):
+        cache = TTLCache("test", ttl=10)
+        with patch("uw_msca.cache.time.monotonic", return_value=100):
+            cache.set("key", "value")
+            self.assertEqual(cache.get("key"), "value")
+
+        with patch("uw_msca.cache.time.monotonic", return_value=111):
+            self.assertIsNone(cache.get("key"))
+
+        self.assertEqual(cache.stats(), {"hits": 1, "misses": 1, "size": 0})
+
+    def test_invalidate(self):
+        cache = TTLCache("test")
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.invalidate("a")
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.get("b"), 2)
+        cache.invalidate()
+        self.assertIsNone(cache.get("b"))
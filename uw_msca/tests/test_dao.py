@@ -0,0 +1,40 @@
+# Copyright 2025 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+from unittest import TestCase
+from commonconf import override_settings
+from uw_msca.dao import MSCA_DAO
+from uw_msca.tests.http_server import BlobServer
+
+
+class ExternalPoolTest(TestCase):
+    def setUp(self):
+        MSCA_DAO.reset_external_pool()
+
+    def tearDown(self):
+        MSCA_DAO.reset_external_pool()
+
+    def test_shared_pool(self):
+        dao = MSCA_DAO()
+        self.assertIs(dao.external_pool_manager(),
+                      MSCA_DAO().external_pool_manager())
+
+        with BlobServer({"/report": b"a,b\r\n1,2\r\n"}) as server:
+            for i in range(3):
+                response = dao.get_external_resource(server.url("/report"))
+                self.assertEqual(response.status, 200)
+                self.assertEqual(response.data, b"a,b\r\n1,2\r\n")
+
+            stats = dao.external_pool_stats()
+
+        self.assertEqual(stats[server.url("")], {
+            "requests": 3, "connections": 1, "reused": 2})
+
+    @override_settings(RESTCLIENTS_MSCA_EXTERNAL_POOL_SIZE=3,
+                       RESTCLIENTS_MSCA_EXTERNAL_TIMEOUT=5,
+                       RESTCLIENTS_MSCA_EXTERNAL_RETRIES=4)
+    def test_settings(self):
+        http = MSCA_DAO().external_pool_manager()
+        self.assertEqual(http.connection_pool_kw["maxsize"], 3)
+        self.assertEqual(http.connection_pool_kw["timeout"].read_timeout, 5)
+        self.assertEqual(http.connection_pool_kw["retries"].total, 4)
@@ -1,8 +1,18 @@
 # Copyright 2025 UW-IT, University of Washington
 # SPDX-License-Identifier: Apache-2.0
 
+import threading
 from unittest import TestCase
-from uw_msca.delegate import get_delegates
+from unittest.mock import patch
+from commonconf import override_settings
+from restclients_core.exceptions import DataFailureException
+from uw_msca import DAO, get_resource
+from uw_msca.delegate import (
+    get_delegates, get_delegates_bulk, get_all_delegates,
+    iter_all_delegates, get_all_delegates_index, set_delegate,
+    remove_delegate, DELEGATE_CACHE, _parse_delegates,
+    _delegates_from_get_delegates, _delegates_from_perms_response)
+from uw_msca.models import DelegateRecord
 from uw_msca.util import fdao_msca_override
 
 
@@ -14,3 +24,218 @@ class ValidateUserTest(TestCase):
 
         delegates = get_delegates('bill')
         self.assertEqual(len(delegates), 1)
+
+    def test_get_delegates_bulk(self):
+        delegates, errors = get_delegates_bulk(
+            ['javerage', 'bill', 'nobody', 'javerage'], max_workers=2)
+        self.assertEqual(sorted(delegates.keys()), ['bill', 'javerage'])
+        self.assertEqual(len(delegates['javerage']), 2)
+        self.assertEqual(len(delegates['bill']), 1)
+        self.assertEqual(list(errors.keys()), ['nobody'])
+        self.assertIsInstance(errors['nobody'], DataFailureException)
+        self.assertEqual(errors['nobody'].status, 404)
+
+    def test_get_all_delegates(self):
+        with patch.object(DAO, 'get_external_resource', side_effect=[
+                DAO.getURL('/mbx/delegate_csv_fixture')]):
+            lines = get_all_delegates()
+        self.assertEqual(lines[0], 'Identity,User,AccessRights')
+
+    def test_iter_all_delegates(self):
+        with patch.object(DAO, 'get_external_resource', side_effect=[
+                DAO.getURL('/mbx/delegate_csv_fixture')]) as mock:
+            delegates = list(iter_all_delegates())
+
+        mock.assert_called_once_with(
+            'https://pplatreports.blob.core.windows.net/'
+            'example-delegate-csv-url', preload_content=False)
+        self.assertEqual(len(delegates), 4)
+        self.assertEqual(delegates[0].user, 'javerage')
+        self.assertEqual(delegates[0].delegate, 'jstaff@uw.edu')
+        self.assertEqual(delegates[0].access_right, 'FullAccessandSendAs')
+
+    def test_get_all_delegates_index(self):
+        with patch.object(DAO, 'get_external_resource', side_effect=[
+                DAO.getURL('/mbx/delegate_csv_fixture')]):
+            index = get_all_delegates_index()
+
+        self.assertEqual(len(index), 4)
+        self.assertEqual(
+            [d.delegate for d in index.delegates_for('javerage')],
+            ['jstaff@uw.edu', 'bill@uw.edu'])
+        self.assertEqual(
+            [(d.user, d.access_right)
+             for d in index.mailboxes_for('bill@uw.edu')],
+            [('javerage', 'SendAs'), ('jstaff', 'FullAccess')])
+        self.assertEqual(index.delegates_for('nobody'), [])
+
+
+@fdao_msca_override
+@override_settings(RESTCLIENTS_MSCA_DELEGATE_CACHE_TTL=60)
+class DelegateCacheTest(TestCase):
+    def setUp(self):
+        DELEGATE_CACHE.invalidate()
+
+    def tearDown(self):
+        DELEGATE_CACHE.invalidate()
+
+    def test_get_delegates(self):
+        with patch('uw_msca.delegate.get_resource',
+                   wraps=get_resource) as mock:
+            first = get_delegates('javerage')
+            second = get_delegates('javerage')
+
+        self.assertEqual(mock.call_count, 1)
+        self.assertEqual(len(second), 2)
+        self.assertIsNot(first, second)
+
+    def test_write_through(self):
+        # there is no GetDelegates resource for jstaff
+        self.assertRaises(DataFailureException, get_delegates, 'jstaff')
+
+        set_delegate('jstaff', 'javerage', 'SendAs')
+        delegates = get_delegates('jstaff')
+        self.assertEqual(len(delegates), 1)
+        self.assertEqual(delegates[0].delegate, 'javerage@uw.edu')
+        self.assertEqual(delegates[0].access_right, 'SendAs')
+
+        remove_delegate('jstaff', 'javerage', 'SendAs')
+        self.assertEqual(get_delegates('jstaff'), [])
+
+    def test_expires(self):
+        with patch('uw_msca.cache.time.monotonic', return_value=100):
+            set_delegate('jstaff', 'javerage', 'SendAs')
+        with patch('uw_msca.cache.time.monotonic', return_value=161):
+            self.assertRaises(
+                DataFailureException, get_delegates, 'jstaff')
+
+    def assert_refetched(self, netid):
+        with patch('uw_msca.delegate.get_resource',
+                   wraps=get_resource) as mock:
+            get_delegates(netid)
+        self.assertEqual(mock.call_count, 1)
+
+    def test_malformed_write(self):
+        get_delegates('javerage')
+        with patch('uw_msca.delegate.post_resource',
+                   return_value=b'{"ok": true}'):
+            self.assertEqual(remove_delegate(
+                'javerage', 'bill@uw.edu', 'SendAs'), [])
+        self.assertIsNone(DELEGATE_CACHE.get('javerage'))
+        self.assertIsNone(DELEGATE_CACHE.get(None))
+        self.assert_refetched('javerage')
+
+    def test_mismatched_write(self):
+        get_delegates('javerage')
+        with patch('uw_msca.delegate.post_resource',
+                   return_value=b'{"TargetNetid": "bill", "Delegates": []}'):
+            remove_delegate('javerage', 'bill@uw.edu', 'SendAs')
+        self.assertIsNone(DELEGATE_CACHE.get('javerage'))
+        self.assertIsNone(DELEGATE_CACHE.get('bill'))
+
+    def test_failed_write(self):
+        get_delegates('javerage')
+        with patch('uw_msca.delegate.post_resource', side_effect=(
+                DataFailureException('/remove', 504, 'timeout'))):
+            self.assertRaises(DataFailureException, remove_delegate,
+                              'javerage', 'bill@uw.edu', 'SendAs')
+        self.assert_refetched('javerage')
+
+    def test_get_racing_write(self):
+        stale = get_resource('/mbx/v1/javerage/GetDelegates')
+
+        def get_during_write(url):
+            # the write is sent and answered while the GET is in flight
+            set_delegate('javerage', 'bill@uw.edu', 'SendAs')
+            return stale
+
+        written = (b'{"TargetNetid": "javerage", "Delegates": '
+                   b'[{"User": "bill@uw.edu", "AccessRights": "SendAs"}]}')
+        with patch('uw_msca.delegate.post_resource', return_value=written):
+            with patch('uw_msca.delegate.get_resource',
+                       side_effect=get_during_write):
+                self.assertEqual(len(get_delegates('javerage')), 2)
+
+        self.assertEqual(
+            [d.delegate for d in get_delegates('javerage')], ['bill@uw.edu'])
+
+    def test_get_answered_after_write(self):
+        stale = get_resource('/mbx/v1/javerage/GetDelegates')
+        written = (b'{"TargetNetid": "javerage", "Delegates": '
+                   b'[{"User": "bill@uw.edu", "AccessRights": "SendAs"}]}')
+        post_sent = threading.Event()
+        get_sent = threading.Event()
+        write_done = threading.Event()
+
+        def post(url, body):
+            post_sent.set()
+            get_sent.wait(10)
+            return written
+
+        def get(url):
+            # sent while the write is in flight, answered after it
+            get_sent.set()
+            write_done.wait(10)
+            return stale
+
+        def write():
+            try:
+                set_delegate('javerage', 'bill@uw.edu', 'SendAs')
+            finally:
+                write_done.set()
+
+        with patch('uw_msca.delegate.post_resource', side_effect=post), \
+                patch('uw_msca.delegate.get_resource', side_effect=get):
+            writer = threading.Thread(target=write)
+            writer.start()
+            self.assertTrue(post_sent.wait(10))
+            self.assertEqual(len(get_delegates('javerage')), 2)
+            writer.join(10)
+
+        self.assertEqual(
+            [d.delegate for d in get_delegates('javerage')], ['bill@uw.edu'])
+
+    @override_settings(RESTCLIENTS_MSCA_DELEGATE_CACHE_TTL=0)
+    def test_disabled(self):
+        set_delegate('jstaff', 'javerage', 'SendAs')
+        self.assertRaises(DataFailureException, get_delegates, 'jstaff')
+        self.assertEqual(DELEGATE_CACHE.stats()["size"], 0)
+
+
+@fdao_msca_override
+class DelegateRecordTest(TestCase):
+    def test_get_delegates(self):
+        delegates = get_delegates('javerage', record_class=DelegateRecord)
+        self.assertIsInstance(delegates[0], DelegateRecord)
+        self.assertEqual([d.json_data() for d in delegates],
+                         [d.json_data() for d in get_delegates('javerage')])
+
+    def test_set_delegate(self):
+        delegates = set_delegate(
+            'jstaff', 'javerage', 'SendAs', record_class=DelegateRecord)
+        self.assertEqual([d.json_data() for d in delegates], [{
+            'user': 'jstaff', 'delegate': 'javerage@uw.edu',
+            'access_right': 'SendAs'}])
+
+    def test_parse_delegates(self):
+        self.assertEqual(_parse_delegates(
+            b'[{"netid": "bill", "delegates": '
+            b'[{"User": "jstaff@uw.edu", "AccessRights": "SendAs"}]}]'),
+            ('bill', [('jstaff@uw.edu', 'SendAs')]))
+        self.assertEqual(_parse_delegates(
+            b'{"TargetNetid": "bill", "Delegates": []}'), ('bill', []))
+        # a UTF-8 BOM is skipped, as by json.loads
+        self.assertEqual(_parse_delegates(
+            b'\xef\xbb\xbf{"TargetNetid": "bill", "Delegates": []}'),
+            ('bill', []))
+
+    def test_malformed(self):
+        self.assertEqual(
+            _delegates_from_get_delegates('bill', b'{"netid": "bill"}'), [])
+        self.assertEqual(
+            _delegates_from_get_delegates('bill', b'not json'), [])
+        self.assertEqual(
+            _delegates_from_get_delegates('bill', b'{"netid": "jstaff", '
+                                          b'"delegates": []}'), [])
+        self.assertEqual(_delegates_from_perms_response(
+            b'{"Delegates": []}', 'set_delegate'), [])
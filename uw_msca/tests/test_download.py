@@ -0,0 +1,103 @@
+# Copyright 2025 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+from unittest import TestCase
+from commonconf import override_settings
+from restclients_core.exceptions import DataFailureException
+from urllib3 import PoolManager
+from urllib3.util.retry import Retry
+from uw_msca.dao import MSCA_DAO
+from uw_msca.download import RangedDownloader
+from uw_msca.tests.http_server import BlobServer
+
+
+BLOB = bytes(range(256)) * 41
+
+
+class RangedDownloaderTest(TestCase):
+    def setUp(self):
+        self.http = PoolManager(retries=Retry(total=0, redirect=0))
+        MSCA_DAO.reset_external_pool()
+
+    def tearDown(self):
+        MSCA_DAO.reset_external_pool()
+
+    def ranges(self, server):
+        return [headers.get("Range") for (path, headers) in server.requests]
+
+    def test_download(self):
+        with BlobServer({"/blob": BLOB}) as server:
+            data = RangedDownloader(self.http, chunk_size=4000).download(
+                server.url("/blob"))
+
+        self.assertEqual(data, BLOB)
+        self.assertEqual(self.ranges(server), [
+            "bytes=0-3999", "bytes=4000-7999", "bytes=8000-10495"])
+        etags = {headers.get("If-Match") for (_, headers) in server.requests}
+        self.assertEqual(len(etags - {None}), 1)
+
+    def test_empty(self):
+        with BlobServer({"/blob": b""}) as server:
+            data = RangedDownloader(self.http, chunk_size=4000).download(
+                server.url("/blob"))
+
+        self.assertEqual(data, b"")
+        self.assertEqual(self.ranges(server), ["bytes=0-3999"])
+
+    def test_parallel(self):
+        with BlobServer({"/blob": BLOB}) as server:
+            data = RangedDownloader(
+                self.http, chunk_size=1000, parallel=4).download(
+                    server.url("/blob"))
+
+        self.assertEqual(data, BLOB)
+        self.assertEqual(len(server.requests), 11)
+
+    def test_resume(self):
+        with BlobServer({"/blob": BLOB}, truncate=1) as server:
+            downloader = RangedDownloader(self.http, chunk_size=4000)
+            first, total, etag = downloader._first_range(server.url("/blob"))
+            server.truncate = 1
+            data = downloader._fetch_range(
+                server.url("/blob"), 4000, 7999, etag)
+
+        self.assertEqual(first, BLOB[:4000])
+        self.assertEqual(data, BLOB[4000:8000])
+        # first range retried whole, second resumed from its midpoint
+        self.assertEqual(self.ranges(server), [
+            "bytes=0-3999", "bytes=0-3999", "bytes=4000-7999",
+            "bytes=6000-7999"])
+
+    def test_no_range_support(self):
+        with BlobServer({"/blob": BLOB}, ranges=False) as server:
+            data = RangedDownloader(self.http, chunk_size=4000).download(
+                server.url("/blob"))
+
+        self.assertEqual(data, BLOB)
+        self.assertEqual(len(server.requests), 1)
+
+    def test_changed(self):
+        with BlobServer({"/blob": BLOB}) as server:
+            downloader = RangedDownloader(self.http, chunk_size=4000)
+            first, total, etag = downloader._first_range(server.url("/blob"))
+            server.blobs["/blob"] = BLOB[::-1]
+            with self.assertRaises(DataFailureException) as cm:
+                downloader._fetch_range(server.url("/blob"), 4000, 7999, etag)
+
+        self.assertEqual(cm.exception.status, 412)
+
+    def test_gives_up(self):
+        with BlobServer({"/blob": BLOB}, truncate=10) as server:
+            with self.assertRaises(DataFailureException):
+                RangedDownloader(
+                    self.http, chunk_size=4000, attempts=3).download(
+                        server.url("/blob"))
+
+    @override_settings(RESTCLIENTS_MSCA_EXTERNAL_RANGE_SIZE=4000)
+    def test_dao(self):
+        with BlobServer({"/blob": BLOB}) as server:
+            response = MSCA_DAO().get_external_resource(server.url("/blob"))
+
+        self.assertEqual(response.status, 200)
+        self.assertEqual(response.data, BLOB)
+        self.assertEqual(len(server.requests), 3)
@@ -0,0 +1,99 @@
+# Copyright 2025 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+from uw_msca import DAO
+from uw_msca.drive_state_diff import (
+    DriveStateChange, diff_google_drive_states, save_drive_state_snapshot)
+from uw_msca.models import GoogleDriveStateRecord
+from uw_msca.util import fdao_msca_override
+
+
+def record(drive_id, member, role="organizer", size=100, ou="100GB"):
+    return GoogleDriveStateRecord(
+        drive_id=drive_id, member=member, role=role, size=size,
+        org_unit_name=ou, drive_name="Drive {}".format(drive_id))
+
+
+@fdao_msca_override
+class DriveStateDiffTest(TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.snapshot = os.path.join(self.tmp.name, "snapshot")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def changes(self, drive_states):
+        return sorted(
+            (c.change, c.drive_id, c.member or "", c.fields)
+            for c in diff_google_drive_states(self.snapshot, drive_states))
+
+    def test_diff(self):
+        save_drive_state_snapshot(self.snapshot, [
+            record("A", "a@uw.edu"),
+            record("A", "b@uw.edu", role="reader"),
+            record("B", "a@uw.edu"),
+            record("C", "c@uw.edu", size=5),
+        ])
+
+        self.assertEqual(self.changes([
+            record("A", "a@uw.edu"),
+            record("A", "b@uw.edu", role="writer"),
+            record("A", "d@uw.edu"),
+            record("C", "c@uw.edu", size=7, ou="200GB"),
+            record("D", "a@uw.edu"),
+        ]), [
+            (DriveStateChange.DRIVE_ADDED, "D", "", {
+                "size": (None, 100), "org_unit_name": (None, "100GB"),
+                "drive_name": (None, "Drive D")}),
+            (DriveStateChange.DRIVE_CHANGED, "C", "", {
+                "size": (5, 7), "org_unit_name": ("100GB", "200GB")}),
+            (DriveStateChange.DRIVE_REMOVED, "B", "", {
+                "size": (100, None), "org_unit_name": ("100GB", None),
+                "drive_name": ("Drive B", None)}),
+            (DriveStateChange.MEMBER_ADDED, "A", "d@uw.edu", {
+                "role": (None, "organizer")}),
+            (DriveStateChange.MEMBER_ADDED, "D", "a@uw.edu", {
+                "role": (None, "organizer")}),
+            (DriveStateChange.MEMBER_CHANGED, "A", "b@uw.edu", {
+                "role": ("reader", "writer")}),
+            (DriveStateChange.MEMBER_REMOVED, "B", "a@uw.edu", {
+                "role": ("organizer", None)}),
+        ])
+
+        # the new report is now the snapshot
+        self.assertEqual(self.changes([
+            record("A", "a@uw.edu"),
+            record("A", "b@uw.edu", role="writer"),
+            record("A", "d@uw.edu"),
+            record("C", "c@uw.edu", size=7, ou="200GB"),
+            record("D", "a@uw.edu"),
+        ]), [])
+        self.assertEqual(os.listdir(self.tmp.name), ["snapshot"])
+
+    def test_abandoned_diff(self):
+        save_drive_state_snapshot(self.snapshot, [record("A", "a@uw.edu")])
+        changes = diff_google_drive_states(self.snapshot, [
+            record("B", "b@uw.edu")])
+        next(changes)
+        changes.close()
+
+        # snapshot is unchanged, temporary snapshot removed
+        self.assertEqual(os.listdir(self.tmp.name), ["snapshot"])
+        self.assertEqual(len(self.changes([record("A", "a@uw.edu")])), 0)
+
+    def test_report(self):
+        with patch.object(DAO, "get_external_resource", side_effect=[
+                DAO.getURL("/google/report_response_fixture")]):
+            changes = list(diff_google_drive_states(self.snapshot))
+
+        self.assertEqual(
+            len([c for c in changes
+                 if c.change == DriveStateChange.DRIVE_ADDED]), 2)
+        self.assertEqual(
+            len([c for c in changes
+                 if c.change == DriveStateChange.MEMBER_ADDED]), 3)
@@ -0,0 +1,76 @@
+# Copyright 2025 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+from unittest import TestCase
+from unittest.mock import patch
+from uw_msca import DAO
+from uw_msca.drive_state_index import DriveStateIndex
+from uw_msca.models import GoogleDriveStateRecord
+from uw_msca.util import fdao_msca_override
+
+
+def record(drive_id, member, role="organizer", size=0, ou="100GB"):
+    return GoogleDriveStateRecord(
+        drive_id=drive_id, member=member, role=role, size=size,
+        org_unit_name=ou)
+
+
+@fdao_msca_override
+class DriveStateIndexTest(TestCase):
+    def setUp(self):
+        self.index = DriveStateIndex([
+            record("A", "a@uw.edu", size=95 * 1024),
+            record("A", "b@uw.edu", role="reader", size=95 * 1024),
+            record("B", "a@uw.edu", role="reader", size=50 * 1024),
+            record("C", "c@uw.edu", size=190 * 1024, ou="200GB"),
+            record("D", "a@uw.edu", size=10, ou="uw.edu"),
+        ])
+
+    def drive_ids(self, drives):
+        return [drive.drive_id for drive in drives]
+
+    def test_lookups(self):
+        self.assertEqual(len(self.index), 4)
+        self.assertEqual(self.index.get_drive("C").size, 190 * 1024)
+        self.assertIsNone(self.index.get_drive("Z"))
+        self.assertEqual(
+            self.drive_ids(self.index.drives_for_member("a@uw.edu")),
+            ["A", "B", "D"])
+        self.assertEqual(
+            self.drive_ids(self.index.drives_for_member(
+                "a@uw.edu", role="organizer")), ["A", "D"])
+        self.assertEqual(
+            self.drive_ids(self.index.drives_in_org_unit("100GB")),
+            ["A", "B"])
+
+    def test_size(self):
+        self.assertEqual(
+            self.drive_ids(self.index.drives_in_size_range(
+                50 * 1024, 95 * 1024)), ["B", "A"])
+        self.assertEqual(
+            self.drive_ids(self.index.drives_in_size_range(
+                min_size=100 * 1024)), ["C"])
+        self.assertEqual(
+            self.drive_ids(self.index.top_by_size(2)), ["C", "A"])
+        self.assertEqual(self.index.top_by_size(0), [])
+
+    def test_utilization(self):
+        self.assertEqual(
+            self.drive_ids(self.index.drives_over_utilization(0.9)),
+            ["A", "C"])
+        self.assertEqual(
+            self.drive_ids(self.index.drives_over_utilization(
+                0.9, org_unit_name="100GB")), ["A"])
+        self.assertEqual(
+            self.index.drives_over_utilization(0.5, org_unit_name="uw.edu"),
+            [])
+
+    def test_report(self):
+        with patch.object(DAO, "get_external_resource", side_effect=[
+                DAO.getURL("/google/report_response_fixture")]):
+            index = DriveStateIndex()
+
+        self.assertEqual(len(index), 2)
+        self.assertEqual(
+            self.drive_ids(index.drives_for_member("janedoe@uw.edu")),
+            ["DEADBEEFCoPTYUk9PVA"])
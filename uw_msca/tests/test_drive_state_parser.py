@@ -0,0 +1,71 @@
+# Copyright 2025 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+import csv
+import io
+from unittest import TestCase
+from unittest.mock import patch
+from uw_msca import DAO
+from uw_msca.drive_state_parser import parse_drive_states, split_csv_records
+from uw_msca.models import GoogleDriveState, GoogleDriveStateRecord
+from uw_msca.shared_drive import get_google_drive_states
+from uw_msca.util import fdao_msca_override
+
+
+HEADER = (
+    "id,drive_id,drive_name,member,role,total_members,total_uwowners,"
+    "org_unitID,org_unitName,query_date,size,file_count,size_query_date\r\n")
+
+
+def report(rows):
+    lines = [HEADER]
+    for i in range(rows):
+        # quoted names with commas, newlines and escaped quotes
+        name = '"Drive {0},\r\n""{0}""\n"'.format(i) if i % 3 else str(i)
+        lines.append(
+            f"{i},0A{i:017d},{name},user{i}@uw.edu,organizer,1,1,"
+            f"00gjdgxs{i:07d},100GB,2024-04-03T00:00:00.508Z,{i},{i},"
+            "2024-04-02T14:44:28.376Z\r\n")
+    return "".join(lines).encode("utf-8")
+
+
+@fdao_msca_override
+class DriveStateParserTest(TestCase):
+    def test_split_csv_records(self):
+        data = report(50)
+        for parts in (1, 2, 7, 50, 500):
+            bounds = split_csv_records(data, parts)
+            self.assertEqual(bounds[0], 0)
+            self.assertEqual(bounds[-1], len(data))
+            self.assertLessEqual(len(bounds), parts + 1)
+
+            rows = []
+            for start, end in zip(bounds, bounds[1:]):
+                rows.extend(csv.reader(io.StringIO(
+                    data[start:end].decode("utf-8"), newline="")))
+            self.assertEqual(len(rows), 51)
+            self.assertEqual(rows[2][2], 'Drive 1,\r\n"1"\n')
+
+    def test_parse_drive_states(self):
+        data = report(50)
+        rows = csv.reader(io.StringIO(data.decode("utf-8"), newline=""))
+        decode = GoogleDriveStateRecord.csv_decoder(next(rows))
+        expected = [decode(row) for row in rows]
+
+        for record_class in (GoogleDriveStateRecord, GoogleDriveState):
+            parsed = parse_drive_states(data, record_class, 2, chunks=9)
+            self.assertEqual(len(parsed), 50)
+            self.assertIsInstance(parsed[0], record_class)
+            for record, expect in zip(parsed, expected):
+                self.assertEqual(record.drive_id, expect.drive_id)
+                self.assertEqual(record.drive_name, expect.drive_name)
+                self.assertEqual(record.size, expect.size)
+
+    def test_get_google_drive_states(self):
+        with patch.object(DAO, "get_external_resource", side_effect=[
+                DAO.getURL("/google/report_response_fixture")]):
+            gdrive_states = get_google_drive_states(
+                record_class=GoogleDriveStateRecord, processes=2)
+
+        self.assertEqual(len(gdrive_states), 3)
+        self.assertEqual(gdrive_states[2].size, 974)
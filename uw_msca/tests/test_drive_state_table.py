@@ -0,0 +1,85 @@
+# Copyright 2025 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+import tempfile
+from unittest import TestCase, skipUnless
+from unittest.mock import patch
+from uw_msca import DAO
+from uw_msca.drive_state_table import (
+    load_drive_state_table, save_drive_state_table)
+from uw_msca.models import GoogleDriveStateRecord
+from uw_msca.shared_drive import get_google_drive_states
+from uw_msca.util import fdao_msca_override
+
+
+@fdao_msca_override
+class DriveStateTableTest(TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "drive_states.bin")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_round_trip(self):
+        with patch.object(DAO, "get_external_resource", side_effect=[
+                DAO.getURL("/google/report_response_fixture")]):
+            drive_states = get_google_drive_states()
+
+        save_drive_state_table(self.path, drive_states)
+
+        with load_drive_state_table(self.path) as table:
+            self.assertEqual(len(table), 3)
+            loaded = list(table)
+            self.assertIsInstance(loaded[0], GoogleDriveStateRecord)
+            for expected, record in zip(drive_states, loaded):
+                for name in GoogleDriveStateRecord.__slots__:
+                    self.assertEqual(
+                        getattr(record, name), getattr(expected, name))
+
+            self.assertEqual(table[-1].drive_name, "3rd yrs")
+            self.assertEqual(list(table.column("size")), [307, 307, 974])
+            self.assertEqual(table.column("role"), ["organizer"] * 3)
+            self.assertIs(table[0].drive_id, table[1].drive_id)
+            with self.assertRaises(IndexError):
+                table[3]
+
+    def test_empty(self):
+        save_drive_state_table(self.path, [])
+        with load_drive_state_table(self.path) as table:
+            self.assertEqual(list(table), [])
+
+    def test_not_a_table(self):
+        with open(self.path, "wb") as f:
+            f.write(b"\0" * 64)
+        with self.assertRaises(ValueError):
+            load_drive_state_table(self.path)
+
+    @skipUnless(hasattr(os, "fork"), "requires fork")
+    def test_save_while_loaded(self):
+        with patch.object(DAO, "get_external_resource", side_effect=[
+                DAO.getURL("/google/report_response_fixture")]):
+            drive_states = get_google_drive_states()
+
+        save_drive_state_table(self.path, drive_states * 2000)
+        with load_drive_state_table(self.path) as table:
+            save_drive_state_table(self.path, drive_states[:1])
+
+            # read the old mapping in a child, as truncating the mapped
+            # file would kill the reading process
+            pid = os.fork()
+            if pid == 0:
+                status = 1
+                try:
+                    if (len(table) == 6000 and
+                            table[-1].drive_name == "3rd yrs"):
+                        status = 0
+                finally:
+                    os._exit(status)
+            _, status = os.waitpid(pid, 0)
+            self.assertEqual(status, 0)
+
+        with load_drive_state_table(self.path) as table:
+            self.assertEqual(len(table), 1)
+        self.assertEqual(os.listdir(self.tmp.name), ["drive_states.bin"])
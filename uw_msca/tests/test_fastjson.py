@@ -0,0 +1,37 @@
+# Copyright 2025 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+import json
+from unittest import TestCase
+from unittest.mock import patch
+from commonconf import override_settings
+from uw_msca import fastjson
+
+
+class FastJSONTest(TestCase):
+    def test_loads(self):
+        self.assertEqual(fastjson.loads(b'{"a": [1, "b"]}'), {"a": [1, "b"]})
+        self.assertEqual(fastjson.loads('"\\u00e9"'), "é")
+        self.assertRaises(json.JSONDecodeError, fastjson.loads, b"{")
+
+    def test_stdlib_fallback(self):
+        with patch.object(fastjson, "orjson", None):
+            self.assertEqual(fastjson.loads(b'{"a": 1}'), {"a": 1})
+            self.assertRaises(json.JSONDecodeError, fastjson.loads, b"{")
+
+    def test_stdlib_compatible(self):
+        for data in [b'\xef\xbb\xbf{"a": 1}',
+                     '{"a": 1}'.encode("utf-16"),
+                     b'{"a": NaN}']:
+            expected = json.loads(data)
+            with patch.object(fastjson, "orjson", None):
+                self.assertEqual(repr(fastjson.loads(data)), repr(expected))
+            self.assertEqual(repr(fastjson.loads(data)), repr(expected))
+
+        self.assertRaises(
+            json.JSONDecodeError, fastjson.loads, b'\xef\xbb\xbf{')
+
+    @override_settings(RESTCLIENTS_MSCA_FAST_JSON=False)
+    def test_disabled(self):
+        big = 123456789012345678901234567890
+        self.assertEqual(fastjson.loads(str(big).encode()), big)
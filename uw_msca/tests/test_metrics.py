@@ -0,0 +1,114 @@
+# Copyright 2025 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+from unittest import TestCase
+from restclients_core.exceptions import DataFailureException
+from uw_msca import metrics
+from uw_msca.delegate import get_delegates, set_delegate
+from uw_msca.metrics import (
+    MetricsCollector, endpoint_template, prometheus_text, set_collector,
+    get_collector)
+from uw_msca.util import fdao_msca_override
+
+
+class EndpointTemplateTest(TestCase):
+    def test_templates(self):
+        self.assertEqual(endpoint_template("/mbx/v1/javerage/GetDelegates"),
+                         "/mbx/v1/{netid}/GetDelegates")
+        self.assertEqual(
+            endpoint_template("/mbx/v1/jstaff/SetDelegatePerms/javerage/"
+                              "SendAs"),
+            "/mbx/v1/{netid}/SetDelegatePerms/{delegate}/SendAs")
+        self.assertEqual(endpoint_template("/mbx/v1/ValidateUser?Name=bill"),
+                         "/mbx/v1/ValidateUser")
+        self.assertEqual(endpoint_template("/mbx/v1/GetAccessRights"),
+                         "/mbx/v1/GetAccessRights")
+        self.assertEqual(
+            endpoint_template("/google/v1/drive/0ADrive/setquota"),
+            "/google/v1/drive/{drive_id}/setquota")
+        self.assertEqual(endpoint_template("/google/v1/drive/defaultou"),
+                         "/google/v1/drive/defaultou")
+        self.assertEqual(
+            endpoint_template("https://example.blob.core.windows.net/"
+                              "report.csv?sig=secret"),
+            "https://example.blob.core.windows.net")
+
+
+class MetricsCollectorTest(TestCase):
+    def test_record(self):
+        collector = MetricsCollector(buckets=(0.1, 1))
+        collector.record("/a", "GET", 200, 0.05, 10)
+        collector.record("/a", "GET", 200, 0.5, 20, retries=1)
+        collector.record("/a", "GET", 200, 5, 30)
+        collector.record("/a", "GET", 500, 0.05)
+
+        snapshot = collector.snapshot()
+        ok = snapshot[("/a", "GET", 200)]
+        self.assertEqual(ok.count, 3)
+        self.assertEqual(ok.buckets, [1, 1, 1])
+        self.assertEqual(ok.bytes_received, 60)
+        self.assertEqual(ok.retries, 1)
+        self.assertEqual(snapshot[("/a", "GET", 500)].count, 1)
+
+        collector.reset()
+        self.assertEqual(collector.snapshot(), {})
+
+    def test_prometheus_text(self):
+        collector = MetricsCollector(buckets=(0.1, 1))
+        collector.record("/a", "GET", 200, 0.05, 10)
+        collector.record("/a", "GET", 200, 0.5, 20, retries=2)
+
+        text = prometheus_text(collector)
+        labels = 'endpoint="/a",method="GET",status="200"'
+        self.assertIn("# TYPE uw_msca_request_duration_seconds histogram",
+                      text)
+        self.assertIn('uw_msca_request_duration_seconds_bucket{'
+                      + labels + ',le="0.1"} 1', text)
+        self.assertIn('uw_msca_request_duration_seconds_bucket{'
+                      + labels + ',le="+Inf"} 2', text)
+        self.assertIn('uw_msca_request_duration_seconds_count{'
+                      + labels + '} 2', text)
+        self.assertIn('uw_msca_response_bytes_total{' + labels + '} 30', text)
+        self.assertIn('uw_msca_request_retries_total{' + labels + '} 2', text)
+
+
+@fdao_msca_override
+class RequestMetricsTest(TestCase):
+    def setUp(self):
+        self.previous = get_collector()
+        self.collector = MetricsCollector()
+        set_collector(self.collector)
+
+    def tearDown(self):
+        set_collector(self.previous)
+
+    def test_requests(self):
+        get_delegates('javerage')
+        get_delegates('bill')
+        set_delegate('jstaff', 'javerage', 'SendAs')
+        self.assertRaises(DataFailureException, get_delegates, 'nobody')
+
+        snapshot = self.collector.snapshot()
+        self.assertEqual(sorted(snapshot.keys()), [
+            ("/mbx/v1/{netid}/GetDelegates", "GET", 200),
+            ("/mbx/v1/{netid}/GetDelegates", "GET", 404),
+            ("/mbx/v1/{netid}/SetDelegatePerms/{delegate}/SendAs",
+             "POST", 200),
+        ])
+        gets = snapshot[("/mbx/v1/{netid}/GetDelegates", "GET", 200)]
+        self.assertEqual(gets.count, 2)
+        self.assertGreater(gets.bytes_received, 0)
+
+    def test_disabled(self):
+        set_collector(None)
+        get_delegates('javerage')
+        self.assertEqual(self.collector.snapshot(), {})
+
+    def test_failing_collector(self):
+        class Broken:
+            def record(self, *args):
+                raise RuntimeError("broken")
+
+        set_collector(Broken())
+        self.assertEqual(len(get_delegates('javerage')), 2)
+        metrics.record("GET", "/a", 200, 0.1)
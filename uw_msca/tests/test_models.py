@@ -1,12 +1,38 @@
 # Copyright 2025 UW-IT, University of Washington
 # SPDX-License-Identifier: Apache-2.0
 
+import csv
+import io
 from unittest import TestCase
 
 from uw_msca.models import (
+    Delegate,
+    DelegateRecord,
+    GoogleDriveState,
+    GoogleDriveStateRecord,
     Quota,
 )
 
+REPORT = (
+    "id,drive_id,drive_name,member,role,total_members,total_uwowners,"
+    "org_unitID,org_unitName,query_date,size,file_count,size_query_date\r\n"
+    "1,DEADBEEFAgMidUk9PVA,\"Math, Victory\",braxton@uw.edu,organizer,2,2,"
+    "00gjdgxs0123458,100GB,2024-04-03T00:00:00.508Z,,8,"
+    "2024-04-02T14:44:28.376Z\r\n"
+)
+
+
+class Test_DelegateRecord(TestCase):
+    def test_matches_delegate(self):
+        data = {"User": "jstaff@uw.edu", "AccessRights": "SendAs"}
+        record = DelegateRecord().from_json("javerage", data)
+        self.assertEqual(
+            record.json_data(),
+            Delegate().from_json("javerage", data).json_data())
+        self.assertEqual(str(record), str(DelegateRecord(
+            user="javerage", delegate="jstaff@uw.edu", access_right="SendAs")))
+        self.assertFalse(hasattr(record, "__dict__"))
+
 
 class Test_Quota(TestCase):
     def test_to_str(self):
@@ -22,3 +48,38 @@ class Test_Quota(TestCase):
     def test_to_int_errors(self):
         with self.assertRaises(ValueError):
             Quota.to_int("100")
+
+
+class Test_GoogleDriveState_csv_decoder(TestCase):
+    def test_matches_from_csv(self):
+        expected = GoogleDriveState.from_csv(
+            next(csv.DictReader(io.StringIO(REPORT))))
+
+        rows = csv.reader(io.StringIO(REPORT))
+        decode = GoogleDriveState.csv_decoder(next(rows))
+        decoded = decode(next(rows))
+
+        assert isinstance(decoded, GoogleDriveState)
+        for field in ("drive_id", "drive_name", "member", "role",
+                      "total_members", "total_uw_owners", "org_unit_id",
+                      "org_unit_name", "query_date", "size", "file_count",
+                      "size_query_date", "id"):
+            assert getattr(decoded, field) == getattr(expected, field)
+
+        assert decoded.size == 0
+        assert decoded.quota_limit == 100
+
+    def test_record_class(self):
+        rows = csv.reader(io.StringIO(REPORT))
+        decode = GoogleDriveStateRecord.csv_decoder(next(rows))
+        decoded = decode(next(rows))
+        assert isinstance(decoded, GoogleDriveStateRecord)
+        assert decoded.total_uw_owners == 2
+
+    def test_errors(self):
+        with self.assertRaises(ValueError):
+            GoogleDriveState.csv_decoder(["id", "bogus"])
+
+        decode = GoogleDriveState.csv_decoder(["id", "drive_id"])
+        with self.assertRaises(ValueError):
+            decode(["1"])
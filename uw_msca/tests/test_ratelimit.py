@@ -0,0 +1,164 @@
+# Copyright 2025 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+import fcntl
+import os
+import select
+import tempfile
+from unittest import TestCase, skipUnless
+from unittest.mock import patch
+from commonconf import override_settings
+from uw_msca.delegate import set_delegate
+from uw_msca.ratelimit import (
+    TokenBucket, FileTokenBucket, request_class, get_limiter, reserve,
+    reset_limiters, READ, DELEGATE_WRITE, QUOTA_WRITE)
+
+
+class TokenBucketTest(TestCase):
+    def test_acquire(self):
+        clock = [100.0]
+
+        def sleep(seconds):
+            clock[0] += seconds
+
+        with patch("uw_msca.ratelimit.time.monotonic",
+                   side_effect=lambda: clock[0]), \
+                patch("uw_msca.ratelimit.time.sleep", side_effect=sleep):
+            bucket = TokenBucket(2, burst=2)
+            self.assertEqual(bucket.acquire(), 0)
+            self.assertEqual(bucket.acquire(), 0)
+            self.assertEqual(bucket.acquire(), 0.5)
+            self.assertEqual(clock[0], 100.5)
+
+    def test_invalid_rate(self):
+        with self.assertRaises(ValueError):
+            TokenBucket(0)
+
+    def test_reserve(self):
+        with patch("uw_msca.ratelimit.time.monotonic", return_value=100):
+            bucket = TokenBucket(2, burst=1)
+            self.assertEqual(bucket.reserve(), 0)
+            self.assertEqual(bucket.reserve(), 0.5)
+            self.assertEqual(bucket.reserve(), 1.0)
+
+        with patch("uw_msca.ratelimit.time.monotonic", return_value=102):
+            self.assertEqual(bucket.reserve(), 0)
+
+
+class FileTokenBucketTest(TestCase):
+    def test_shared(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "read.bucket")
+            # separate descriptors lock like separate processes
+            first = FileTokenBucket(path, 2, burst=2)
+            second = FileTokenBucket(path, 2, burst=2)
+            try:
+                with patch("uw_msca.ratelimit.time.time", return_value=100):
+                    self.assertEqual(first.reserve(), 0)
+                    self.assertEqual(second.reserve(), 0)
+                    self.assertEqual(first.reserve(), 0.5)
+                    self.assertEqual(second.reserve(), 1.0)
+
+                with patch("uw_msca.ratelimit.time.time", return_value=103):
+                    self.assertEqual(second.reserve(), 0)
+            finally:
+                first.close()
+                second.close()
+
+    @skipUnless(hasattr(os, "fork"), "requires fork")
+    def test_forked(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            bucket = FileTokenBucket(os.path.join(tmp, "read.bucket"), 100)
+            try:
+                # stands in for the parent being mid-reserve when the child
+                # reserves
+                fcntl.flock(bucket._fd, fcntl.LOCK_EX)
+                done_r, done_w = os.pipe()
+                pid = os.fork()
+                if pid == 0:
+                    status = 1
+                    try:
+                        os.close(done_r)
+                        bucket.reserve()
+                        os.write(done_w, b"x")
+                        status = 0
+                    finally:
+                        os._exit(status)
+
+                os.close(done_w)
+                try:
+                    # the child is excluded by the parent's lock...
+                    ready, _, _ = select.select([done_r], [], [], 0.5)
+                    self.assertEqual(ready, [])
+
+                    # ...until it is released
+                    fcntl.flock(bucket._fd, fcntl.LOCK_UN)
+                    ready, _, _ = select.select([done_r], [], [], 10)
+                    self.assertEqual(ready, [done_r])
+                finally:
+                    os.close(done_r)
+                    _, status = os.waitpid(pid, 0)
+                self.assertEqual(status, 0)
+            finally:
+                bucket.close()
+
+
+class RequestRateLimitTest(TestCase):
+    def setUp(self):
+        reset_limiters()
+
+    def tearDown(self):
+        reset_limiters()
+
+    def test_request_class(self):
+        self.assertEqual(request_class(
+            "GET", "/mbx/v1/javerage/GetDelegates"), READ)
+        self.assertEqual(request_class(
+            "POST", "/mbx/v1/jstaff/SetDelegatePerms/javerage/SendAs"),
+            DELEGATE_WRITE)
+        self.assertEqual(request_class(
+            "PATCH", "/mbx/v1/jstaff/UpdateDelegatePerms-azf/a/b/c"),
+            DELEGATE_WRITE)
+        self.assertEqual(request_class(
+            "PUT", "/google/v1/drive/0ADrive/setquota"), QUOTA_WRITE)
+        self.assertIsNone(request_class(
+            "GET", "https://example.blob.core.windows.net/report.csv"))
+
+    def test_unlimited(self):
+        self.assertIsNone(get_limiter(READ))
+        self.assertEqual(reserve("GET", "/mbx/v1/GetAccessRights"), 0)
+
+    @override_settings(RESTCLIENTS_MSCA_RATE_LIMIT_DELEGATE_WRITE=1,
+                       RESTCLIENTS_MSCA_RATE_LIMIT_READ=100)
+    def test_budgets(self):
+        with patch("uw_msca.ratelimit.time.monotonic", return_value=100):
+            for i in range(2):
+                self.assertEqual(reserve(
+                    "POST", "/mbx/v1/jstaff/SetDelegatePerms/a/SendAs"),
+                    float(i))
+                self.assertEqual(reserve(
+                    "GET", "/mbx/v1/GetAccessRights"), 0)
+            self.assertEqual(reserve(
+                "PUT", "/google/v1/drive/0ADrive/setquota"), 0)
+
+    def test_file_backend(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            with override_settings(RESTCLIENTS_MSCA_RATE_LIMIT_QUOTA_WRITE=5,
+                                   RESTCLIENTS_MSCA_RATE_LIMIT_DIR=tmp):
+                limiter = get_limiter(QUOTA_WRITE)
+                self.assertIsInstance(limiter, FileTokenBucket)
+                self.assertEqual(limiter.path,
+                                 os.path.join(tmp, "quota_write.bucket"))
+                self.assertIs(get_limiter(QUOTA_WRITE), limiter)
+                reset_limiters()
+
+    @override_settings(RESTCLIENTS_MSCA_RATE_LIMIT_DELEGATE_WRITE=1,
+                       RESTCLIENTS_MSCA_DAO_CLASS='Mock')
+    @patch("uw_msca.retry.time.sleep")
+    def test_requests(self, sleep):
+        set_delegate('jstaff', 'javerage', 'SendAs')
+        set_delegate('jstaff', 'javerage', 'SendAs')
+        # time.sleep is also patched for the mock DAO's own zero sleeps
+        delays = [c.args[0] for c in sleep.call_args_list if c.args[0]]
+        self.assertEqual(len(delays), 1)
+        self.assertGreater(delays[0], 0.5)
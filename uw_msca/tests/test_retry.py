@@ -0,0 +1,233 @@
+# Copyright 2025 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+import ssl
+from unittest import TestCase
+from unittest.mock import patch
+from commonconf import override_settings
+from restclients_core.exceptions import DataFailureException
+from restclients_core.models import MockHTTP
+from uw_msca import get_resource, post_resource
+from uw_msca.retry import (
+    RetryPolicy, CircuitBreaker, CircuitOpen, get_breaker, reset_breakers,
+    send_async)
+from uw_msca.util import fdao_msca_override
+
+
+def mock_response(status, data=b"{}", headers=None):
+    response = MockHTTP()
+    response.status = status
+    response.data = data
+    response.headers = headers or {}
+    return response
+
+
+class RetryPolicyTest(TestCase):
+    def test_should_retry(self):
+        policy = RetryPolicy(attempts=3)
+        self.assertTrue(policy.should_retry("GET", 503, 1))
+        self.assertTrue(policy.should_retry("GET", 0, 2))
+        self.assertFalse(policy.should_retry("GET", 503, 3))
+        self.assertFalse(policy.should_retry("GET", 404, 1))
+        self.assertTrue(policy.should_retry("POST", 429, 1))
+        self.assertFalse(policy.should_retry("POST", 503, 1))
+        self.assertFalse(policy.should_retry("POST", 0, 1))
+
+    def test_backoff(self):
+        policy = RetryPolicy(backoff=0.5, max_backoff=3)
+        with patch("uw_msca.retry.random.uniform",
+                   side_effect=lambda low, high: high):
+            self.assertEqual([policy.delay(a) for a in range(1, 6)],
+                             [0.5, 1, 2, 3, 3])
+
+    def test_retry_after(self):
+        policy = RetryPolicy(max_backoff=30)
+        self.assertEqual(policy.delay(
+            1, mock_response(429, headers={"Retry-After": "7"})), 7)
+        self.assertEqual(policy.delay(
+            1, mock_response(429, headers={"Retry-After": "120"})), 30)
+        self.assertEqual(policy.delay(1, mock_response(503, headers={
+            "Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"})), 0)
+
+    @override_settings(RESTCLIENTS_MSCA_RETRY_ATTEMPTS="5",
+                       RESTCLIENTS_MSCA_RETRY_STATUSES="429,503")
+    def test_from_settings(self):
+        policy = RetryPolicy.from_settings()
+        self.assertEqual(policy.attempts, 5)
+        self.assertEqual(policy.statuses, {429, 503})
+
+
+class CircuitBreakerTest(TestCase):
+    def test_states(self):
+        breaker = CircuitBreaker("/a", failures=2, reset=10)
+        with patch("uw_msca.retry.time.monotonic", return_value=100):
+            breaker.record(True)
+            breaker.before_request("/a")
+            breaker.record(True)
+            self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+            with self.assertRaises(CircuitOpen) as cm:
+                breaker.before_request("/a")
+            self.assertEqual(cm.exception.status, 503)
+            self.assertEqual(cm.exception.retry_in, 10)
+
+        with patch("uw_msca.retry.time.monotonic", return_value=111):
+            breaker.before_request("/a")
+            self.assertEqual(breaker.state, CircuitBreaker.HALF_OPEN)
+            # only the one trial request
+            self.assertRaises(CircuitOpen, breaker.before_request, "/a")
+            breaker.record(True)
+            self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+
+        with patch("uw_msca.retry.time.monotonic", return_value=122):
+            breaker.before_request("/a")
+            breaker.record(False)
+            self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+            self.assertEqual(breaker.failures, 0)
+
+    def test_stale_trial(self):
+        breaker = CircuitBreaker("/a", failures=1, reset=10)
+        with patch("uw_msca.retry.time.monotonic", return_value=100):
+            breaker.record(True)
+        with patch("uw_msca.retry.time.monotonic", return_value=111):
+            breaker.before_request("/a")
+        with patch("uw_msca.retry.time.monotonic", return_value=115):
+            self.assertRaises(CircuitOpen, breaker.before_request, "/a")
+
+        # the trial's result was never recorded
+        with patch("uw_msca.retry.time.monotonic", return_value=122):
+            breaker.before_request("/a")
+            self.assertEqual(breaker.state, CircuitBreaker.HALF_OPEN)
+
+
+@fdao_msca_override
+class RetryRequestTest(TestCase):
+    def setUp(self):
+        reset_breakers()
+
+    def tearDown(self):
+        reset_breakers()
+
+    @patch("uw_msca.retry.time.sleep")
+    def test_throttled(self, sleep):
+        with patch("uw_msca.DAO.getURL", side_effect=[
+                mock_response(429, headers={"Retry-After": "2"}),
+                mock_response(503),
+                mock_response(200, b'{"ok": true}')]) as mock:
+            self.assertEqual(get_resource("/mbx/v1/javerage/GetDelegates"),
+                             b'{"ok": true}')
+
+        self.assertEqual(mock.call_count, 3)
+        self.assertEqual(sleep.call_args_list[0].args, (2.0,))
+
+    @patch("uw_msca.retry.time.sleep")
+    def test_gives_up(self, sleep):
+        with patch("uw_msca.DAO.getURL",
+                   return_value=mock_response(503)) as mock:
+            with self.assertRaises(DataFailureException) as cm:
+                get_resource("/mbx/v1/javerage/GetDelegates")
+
+        self.assertEqual(cm.exception.status, 503)
+        self.assertEqual(mock.call_count, 3)
+
+    @patch("uw_msca.retry.time.sleep")
+    def test_not_idempotent(self, sleep):
+        with patch("uw_msca.DAO.postURL", side_effect=[
+                mock_response(503)]) as mock:
+            self.assertRaises(DataFailureException, post_resource,
+                              "/mbx/v1/jstaff/SetDelegatePerms/x/SendAs", "")
+
+        self.assertEqual(mock.call_count, 1)
+        sleep.assert_not_called()
+
+    @patch("uw_msca.retry.time.sleep")
+    def test_connection_error(self, sleep):
+        with patch("uw_msca.DAO.getURL", side_effect=[
+                DataFailureException("/mbx/v1/GetAccessRights", 0, "reset"),
+                mock_response(200, b"[]")]):
+            self.assertEqual(get_resource("/mbx/v1/GetAccessRights"), b"[]")
+
+    @override_settings(RESTCLIENTS_MSCA_RETRY_ATTEMPTS=1,
+                       RESTCLIENTS_MSCA_CIRCUIT_FAILURES=2,
+                       RESTCLIENTS_MSCA_CIRCUIT_RESET=10)
+    def test_circuit(self):
+        with patch("uw_msca.DAO.getURL",
+                   return_value=mock_response(500)) as mock:
+            for netid in ("javerage", "bill"):
+                self.assertRaises(
+                    DataFailureException, get_resource,
+                    "/mbx/v1/{}/GetDelegates".format(netid))
+            self.assertRaises(CircuitOpen, get_resource,
+                              "/mbx/v1/jstaff/GetDelegates")
+            self.assertEqual(mock.call_count, 2)
+
+            # other endpoints are unaffected
+            self.assertRaises(DataFailureException, get_resource,
+                              "/mbx/v1/GetAccessRights")
+            self.assertEqual(mock.call_count, 3)
+
+    @patch("uw_msca.retry.asyncio.sleep")
+    def test_async(self, sleep):
+        responses = [mock_response(502), mock_response(200, b"[]")]
+
+        async def request():
+            return responses.pop(0)
+
+        response, retries = asyncio.run(
+            send_async("GET", "/mbx/v1/GetAccessRights", request))
+        self.assertEqual(response.data, b"[]")
+        self.assertEqual(retries, 1)
+        self.assertEqual(sleep.call_count, 1)
+
+    @override_settings(RESTCLIENTS_MSCA_RETRY_ATTEMPTS=1,
+                       RESTCLIENTS_MSCA_CIRCUIT_FAILURES=1,
+                       RESTCLIENTS_MSCA_CIRCUIT_RESET=10)
+    def test_trial_raises(self):
+        url = "/mbx/v1/GetAccessRights"
+        clock = patch("uw_msca.retry.time.monotonic", return_value=100)
+        with clock, patch("uw_msca.DAO.getURL",
+                          return_value=mock_response(503)):
+            self.assertRaises(DataFailureException, get_resource, url)
+
+        with patch("uw_msca.retry.time.monotonic", return_value=111):
+            with patch("uw_msca.DAO.getURL",
+                       side_effect=ssl.SSLError("handshake")):
+                self.assertRaises(ssl.SSLError, get_resource, url)
+            self.assertEqual(get_breaker(url).state, CircuitBreaker.OPEN)
+            self.assertRaises(CircuitOpen, get_resource, url)
+
+        with patch("uw_msca.retry.time.monotonic", return_value=122):
+            with patch("uw_msca.DAO.getURL",
+                       return_value=mock_response(200, b"[]")):
+                for i in range(3):
+                    self.assertEqual(get_resource(url), b"[]")
+        self.assertEqual(get_breaker(url).state, CircuitBreaker.CLOSED)
+
+    @override_settings(RESTCLIENTS_MSCA_RETRY_ATTEMPTS=1,
+                       RESTCLIENTS_MSCA_CIRCUIT_FAILURES=1,
+                       RESTCLIENTS_MSCA_CIRCUIT_RESET=10)
+    def test_async_trial_cancelled(self):
+        url = "/mbx/v1/GetAccessRights"
+
+        async def unavailable():
+            return mock_response(503)
+
+        async def cancelled():
+            raise asyncio.CancelledError()
+
+        async def ok():
+            return mock_response(200, b"[]")
+
+        with patch("uw_msca.retry.time.monotonic", return_value=100):
+            response, retries = asyncio.run(
+                send_async("GET", url, unavailable))
+            self.assertEqual(response.status, 503)
+            self.assertEqual(get_breaker(url).state, CircuitBreaker.OPEN)
+
+        with patch("uw_msca.retry.time.monotonic", return_value=111):
+            self.assertRaises(asyncio.CancelledError, asyncio.run,
+                              send_async("GET", url, cancelled))
+            # a cancelled trial doesn't count against the endpoint
+            response, retries = asyncio.run(send_async("GET", url, ok))
+            self.assertEqual(response.data, b"[]")
+        self.assertEqual(get_breaker(url).state, CircuitBreaker.CLOSED)
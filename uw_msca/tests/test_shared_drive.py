@@ -1,6 +1,9 @@
 # Copyright 2025 UW-IT, University of Washington
 # SPDX-License-Identifier: Apache-2.0
 
+import os
+import tempfile
+from datetime import datetime, timezone
 from unittest import TestCase
 from unittest.mock import (
     patch,
@@ -11,12 +14,18 @@ from commonconf import override_settings
 from uw_msca.shared_drive import (
     DAO,
     GoogleDriveState,
+    GoogleDriveStateRecord,
     get_default_org_unit,
     get_default_quota,
     get_google_drive_states,
+    get_google_drives,
+    iter_google_drive_states,
+    plan_drive_quotas,
     set_drive_quota,
+    set_drive_quotas,
     _msca_drive_base_url,
 )
+from uw_msca.report_cache import DriveReportCache
 
 
 @override_settings(
@@ -86,6 +95,176 @@ class Test_get_google_drive_states(BaseGDriveTest):
         assert gdrive_states[0].size == 307
 
 
+class Test_get_google_drive_states_compact(BaseGDriveTest):
+    def test(self):
+        with patch.object(
+            DAO,
+            "get_external_resource",
+            side_effect=[
+                DAO.getURL("/google/report_response_fixture"),
+            ],
+        ):
+            gdrive_states = get_google_drive_states(
+                record_class=GoogleDriveStateRecord)
+
+        assert len(gdrive_states) == 3
+        assert all(
+            isinstance(X, GoogleDriveStateRecord) for X in gdrive_states)
+        assert not hasattr(gdrive_states[0], "__dict__")
+        assert gdrive_states[0].org_unit_id == "00gjdgxs0123458"
+        assert gdrive_states[0].total_uw_owners == 2
+        assert gdrive_states[0].size == 307
+        assert gdrive_states[0].size_gigabytes == 307 / 1024
+        assert gdrive_states[0].drive_id is gdrive_states[1].drive_id
+
+        gdrive_states[0].org_unit_name = "100GB"
+        assert gdrive_states[0].quota_limit == 100
+
+
+class Test_get_google_drive_states_cached(BaseGDriveTest):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        # the fixture report's query_date is 2024-04-03
+        self.utcnow = patch(
+            "uw_msca.report_cache._utcnow",
+            return_value=datetime(2024, 4, 3, 18, tzinfo=timezone.utc))
+        self.utcnow.start()
+
+    def tearDown(self):
+        self.utcnow.stop()
+        self.tmp.cleanup()
+
+    def test(self):
+        with override_settings(
+                RESTCLIENTS_MSCA_DRIVE_REPORT_CACHE_DIR=self.tmp.name):
+            with patch.object(
+                DAO,
+                "get_external_resource",
+                side_effect=[
+                    DAO.getURL("/google/report_response_fixture"),
+                ],
+            ) as mock_download:
+                gdrive_states = get_google_drive_states()
+                cached = get_google_drive_states(
+                    record_class=GoogleDriveStateRecord)
+
+            assert mock_download.call_count == 1
+            assert os.listdir(self.tmp.name) == [
+                "drive_state_report-2024-04-03T00_00_00.508Z.pickle"]
+            assert len(cached) == 3
+            assert isinstance(cached[0], GoogleDriveStateRecord)
+            assert cached[0].size == gdrive_states[0].size == 307
+
+            # expire the cache file
+            path = os.path.join(self.tmp.name, os.listdir(self.tmp.name)[0])
+            os.utime(path, (0, 0))
+            with patch.object(
+                DAO,
+                "get_external_resource",
+                side_effect=[
+                    DAO.getURL("/google/report_response_fixture"),
+                ],
+            ) as mock_download:
+                get_google_drive_states()
+
+            assert mock_download.call_count == 1
+
+    def test_query_date(self):
+        cache = DriveReportCache(self.tmp.name)
+        rows = [["query_date"], ["2024-04-03T00:00:00.508Z"]]
+        cache.save(rows)
+        assert cache.load() == rows
+
+        # stale once the report's day has passed, however recently cached
+        with patch("uw_msca.report_cache._utcnow", return_value=datetime(
+                2024, 4, 4, 0, 1, tzinfo=timezone.utc)):
+            assert cache.load() is None
+
+        cache.clear()
+        cache.save([["query_date"], ["bogus"]])
+        assert cache.load() is None
+
+    def test_ttl(self):
+        cache = DriveReportCache(self.tmp.name, ttl=60)
+        cache.save([["query_date"], ["2024-04-03T00:00:00.508Z"]])
+        path = os.path.join(self.tmp.name, os.listdir(self.tmp.name)[0])
+        mtime = os.path.getmtime(path) - 120
+        os.utime(path, (mtime, mtime))
+        assert cache.load() is None
+
+    def test_max_size(self):
+        cache = DriveReportCache(self.tmp.name, max_size=0)
+        cache.save([["query_date"], ["2024-04-03"]])
+        assert cache.load() is None
+        assert os.listdir(self.tmp.name) == []
+
+
+class Test_iter_google_drive_states(BaseGDriveTest):
+    def test(self):
+        with patch.object(
+            DAO,
+            "get_external_resource",
+            side_effect=[
+                DAO.getURL("/google/report_response_fixture"),
+            ],
+        ):
+            gdrive_states = iter_google_drive_states()
+            assert not isinstance(gdrive_states, list)
+
+            first = next(gdrive_states)
+            assert first.drive_id == "DEADBEEFAgMidUk9PVA"
+            assert len(list(gdrive_states)) == 2
+
+    def test_chunked(self):
+        report = DAO.getURL("/google/report_response_fixture").data
+        report = report.replace(b'"3rd yrs"', '"3rd\nyrs, \u00e9"'.encode())
+
+        class ChunkedResponse:
+            status = 200
+
+            def stream(self, chunk_size):
+                # deliberately split lines and multi-byte characters
+                for i in range(0, len(report), 7):
+                    yield report[i:i + 7]
+
+            def release_conn(self):
+                self.released = True
+
+        response = ChunkedResponse()
+        with patch.object(
+            DAO, "get_external_resource", side_effect=[response]
+        ):
+            gdrive_states = list(iter_google_drive_states())
+
+        assert response.released
+        assert len(gdrive_states) == 3
+        assert gdrive_states[2].drive_name == "3rd\nyrs, \u00e9"
+        assert gdrive_states[2].size == 974
+
+
+class Test_get_google_drives(BaseGDriveTest):
+    def test(self):
+        with patch.object(
+            DAO,
+            "get_external_resource",
+            side_effect=[
+                DAO.getURL("/google/report_response_fixture"),
+            ],
+        ):
+            drives = get_google_drives()
+
+        assert len(drives) == 2
+        drive = drives["DEADBEEFAgMidUk9PVA"]
+        assert drive.drive_name == "Math & Victory"
+        assert drive.size == 307
+        assert drive.file_count == 8
+        assert [m.member for m in drive.members] == [
+            "braxton@uw.edu", "vague@uw.edu"]
+        assert drive.members_with_role("organizer") == [
+            "braxton@uw.edu", "vague@uw.edu"]
+        assert len(drives["DEADBEEFCoPTYUk9PVA"].members) == 1
+
+
 class Test_set_drive_quota(BaseGDriveTest):
     def test(self):
         drive_id = "0AIdwn8Py42DEADBEEF"
@@ -102,3 +281,69 @@ class Test_set_drive_quota(BaseGDriveTest):
         assert result == {
             "message": f"Drive '{drive_id}' successfully moved to 3000GB"
         }
+
+
+class Test_set_drive_quotas(BaseGDriveTest):
+    def test(self):
+        drive_id = "0AIdwn8Py42DEADBEEF"
+        results = set_drive_quotas(
+            {drive_id: 3000, "0AMissingDrive": 200}, max_workers=2)
+
+        assert results[drive_id].succeeded
+        assert results[drive_id].quota == 3000
+        assert results[drive_id].response == {
+            "message": f"Drive '{drive_id}' successfully moved to 3000GB"
+        }
+        assert not results["0AMissingDrive"].succeeded
+        assert results["0AMissingDrive"].error.status == 404
+        assert results["0AMissingDrive"].response is None
+
+    def test_rate_limit(self):
+        with patch("uw_msca.shared_drive.TokenBucket") as bucket:
+            set_drive_quotas({"0AIdwn8Py42DEADBEEF": 3000}, rate_limit=5)
+
+        bucket.assert_called_once_with(5.0)
+        bucket.return_value.acquire.assert_called_once_with()
+
+
+class Test_plan_drive_quotas(BaseGDriveTest):
+    def drive_states(self):
+        return [
+            GoogleDriveStateRecord(
+                drive_id="A", member="a@uw.edu", org_unit_name="100GB"),
+            GoogleDriveStateRecord(
+                drive_id="A", member="b@uw.edu", org_unit_name="100GB"),
+            GoogleDriveStateRecord(
+                drive_id="B", member="a@uw.edu", org_unit_name="200GB"),
+            GoogleDriveStateRecord(
+                drive_id="C", member="c@uw.edu", org_unit_name="uw.edu"),
+        ]
+
+    def test_mapping(self):
+        assert plan_drive_quotas(
+            {"A": 100, "B": 100, "C": 100, "D": 100},
+            drive_states=self.drive_states()) == {"B": 100, "C": 100}
+
+    def test_callable(self):
+        calls = []
+
+        def policy(drive_state):
+            calls.append(drive_state.drive_id)
+            return 200 if drive_state.drive_id != "C" else None
+
+        assert plan_drive_quotas(
+            policy, drive_states=self.drive_states()) == {"A": 200}
+        assert calls == ["A", "B", "C"]
+
+    def test_report(self):
+        with patch.object(
+            DAO,
+            "get_external_resource",
+            side_effect=[
+                DAO.getURL("/google/report_response_fixture"),
+            ],
+        ):
+            changes = plan_drive_quotas(lambda drive_state: 100)
+
+        assert changes == {
+            "DEADBEEFAgMidUk9PVA": 100, "DEADBEEFCoPTYUk9PVA": 100}
@@ -0,0 +1,139 @@
+# Copyright 2025 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+import threading
+import time
+from unittest import TestCase
+from unittest.mock import patch
+from commonconf import override_settings
+from restclients_core.exceptions import DataFailureException
+from restclients_core.util.mock import MockHTTP
+from uw_msca import get_resource, IN_FLIGHT_GETS
+from uw_msca.singleflight import SingleFlight
+
+
+class SingleFlightTest(TestCase):
+    def run_concurrently(self, flight, key, func, callers=5):
+        results = []
+
+        def call():
+            try:
+                results.append(flight.do(key, func))
+            except Exception as ex:
+                results.append(ex)
+
+        coalesced = flight.coalesced
+        threads = [threading.Thread(target=call) for i in range(callers)]
+        for thread in threads:
+            thread.start()
+        return threads, results, coalesced
+
+    def wait_for_followers(self, flight, coalesced):
+        deadline = time.monotonic() + 5
+        while flight.coalesced < coalesced and time.monotonic() < deadline:
+            time.sleep(0.001)
+
+    def test_shared_result(self):
+        flight = SingleFlight()
+        release = threading.Event()
+        calls = []
+
+        def func():
+            calls.append(1)
+            release.wait(5)
+            return "result"
+
+        threads, results, coalesced = self.run_concurrently(
+            flight, "key", func)
+        self.wait_for_followers(flight, coalesced + 4)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, ["result"] * 5)
+
+        # nothing is retained once the call completes
+        self.assertEqual(flight.do("key", lambda: "again"), "again")
+
+    def test_shared_exception(self):
+        flight = SingleFlight()
+        release = threading.Event()
+
+        def func():
+            release.wait(5)
+            raise ValueError("failed")
+
+        threads, results, coalesced = self.run_concurrently(
+            flight, "key", func, callers=3)
+        self.wait_for_followers(flight, coalesced + 2)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(results), 3)
+        for result in results:
+            self.assertIsInstance(result, ValueError)
+
+    def test_distinct_keys(self):
+        flight = SingleFlight()
+        self.assertEqual(flight.do("a", lambda: 1), 1)
+        self.assertEqual(flight.do("b", lambda: 2), 2)
+        self.assertEqual(flight.coalesced, 0)
+
+
+class GetResourceTest(TestCase):
+    def slow_get(self, release, status=200):
+        calls = []
+
+        def getURL(url, headers):
+            calls.append(url)
+            release.wait(5)
+            response = MockHTTP()
+            response.status = status
+            response.data = b'{"ok": true}'
+            return response
+
+        return getURL, calls
+
+    def test_coalesced(self):
+        release = threading.Event()
+        getURL, calls = self.slow_get(release)
+        results = []
+
+        with patch("uw_msca.DAO.getURL", side_effect=getURL):
+            coalesced = IN_FLIGHT_GETS.coalesced
+            threads = [threading.Thread(target=lambda: results.append(
+                get_resource("/mbx/v1/javerage/GetDelegates")))
+                for i in range(4)]
+            for thread in threads:
+                thread.start()
+            deadline = time.monotonic() + 5
+            while (IN_FLIGHT_GETS.coalesced < coalesced + 3 and
+                   time.monotonic() < deadline):
+                time.sleep(0.001)
+            release.set()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(calls, ["/mbx/v1/javerage/GetDelegates"])
+        self.assertEqual(results, [b'{"ok": true}'] * 4)
+
+    @override_settings(RESTCLIENTS_MSCA_RETRY_ATTEMPTS=1)
+    def test_failure(self):
+        release = threading.Event()
+        release.set()
+        getURL, calls = self.slow_get(release, status=500)
+        with patch("uw_msca.DAO.getURL", side_effect=getURL):
+            self.assertRaises(DataFailureException, get_resource, "/fail")
+
+    @override_settings(RESTCLIENTS_MSCA_COALESCE_GETS=False)
+    def test_disabled(self):
+        release = threading.Event()
+        release.set()
+        getURL, calls = self.slow_get(release)
+        with patch("uw_msca.DAO.getURL", side_effect=getURL):
+            get_resource("/a")
+            get_resource("/a")
+
+        self.assertEqual(calls, ["/a", "/a"])
@@ -2,12 +2,23 @@
 # SPDX-License-Identifier: Apache-2.0
 
 from unittest import TestCase
-from uw_msca.validate_user import validate_user
+from unittest.mock import patch
+from commonconf import override_settings
+from restclients_core.exceptions import DataFailureException
+from uw_msca import get_resource
+from uw_msca.cache import invalidate_caches
+from uw_msca.validate_user import validate_user, validate_users
 from uw_msca.util import fdao_msca_override
 
 
 @fdao_msca_override
 class ValidateUserTest(TestCase):
+    def setUp(self):
+        invalidate_caches()
+
+    def tearDown(self):
+        invalidate_caches()
+
     def test_valid_user(self):
         validated = validate_user('javerage')
         self.assertTrue(validated.valid)
@@ -15,3 +26,52 @@ class ValidateUserTest(TestCase):
     def test_invalid_user(self):
         validated = validate_user('bill')
         self.assertFalse(validated.valid)
+
+    def test_validate_users(self):
+        with patch('uw_msca.validate_user.get_resource',
+                   wraps=get_resource) as mock:
+            validated, errors = validate_users(
+                ['javerage', 'bill', 'nobody', 'javerage', 'bill'],
+                max_workers=2)
+
+        self.assertEqual(mock.call_count, 3)
+        self.assertEqual(sorted(validated.keys()), ['bill', 'javerage'])
+        self.assertTrue(validated['javerage'].valid)
+        self.assertFalse(validated['bill'].valid)
+        self.assertIsInstance(errors['nobody'], DataFailureException)
+
+    @override_settings(RESTCLIENTS_MSCA_VALID_USER_CACHE_TTL=300,
+                       RESTCLIENTS_MSCA_INVALID_USER_CACHE_TTL=60)
+    def test_cached(self):
+        validate_users(['javerage', 'bill', 'nobody'])
+        with patch('uw_msca.validate_user.get_resource',
+                   wraps=get_resource) as mock:
+            validated, errors = validate_users(['javerage', 'bill', 'nobody'])
+
+        # failed lookups are not cached
+        mock.assert_called_once_with('/mbx/v1/ValidateUser?Name=nobody')
+        self.assertEqual(len(validated), 2)
+
+    @override_settings(RESTCLIENTS_MSCA_VALID_USER_CACHE_TTL=600,
+                       RESTCLIENTS_MSCA_INVALID_USER_CACHE_TTL=30)
+    def test_negative_ttl(self):
+        with patch('uw_msca.cache.time.monotonic', return_value=100):
+            validate_users(['javerage', 'bill'])
+
+        with patch('uw_msca.cache.time.monotonic', return_value=200):
+            with patch('uw_msca.validate_user.get_resource',
+                       wraps=get_resource) as mock:
+                validate_users(['javerage', 'bill'])
+
+        mock.assert_called_once_with('/mbx/v1/ValidateUser?Name=bill')
+
+    def test_uncached(self):
+        # the caches are disabled unless configured
+        validate_user('javerage')
+        validate_user('bill')
+        with patch('uw_msca.validate_user.get_resource',
+                   wraps=get_resource) as mock:
+            validate_user('javerage')
+            validate_user('bill')
+
+        self.assertEqual(mock.call_count, 2)
@@ -7,20 +7,83 @@ Interface for interacting with the UW MSCA outlook API
 
 import logging
 import json
+from commonconf import settings
 from uw_msca.models import ValidatedUser
-from uw_msca import url_base, get_resource
+from uw_msca import url_base, get_resource, map_concurrently
+from uw_msca.cache import TTLCache
 
 
 logger = logging.getLogger(__name__)
 
+# valid and invalid ValidatedUser's, cached for different lengths of time
+VALID_USER_CACHE = TTLCache("uw_msca.validate_user.valid")
+INVALID_USER_CACHE = TTLCache("uw_msca.validate_user.invalid")
+
 
 def validate_user(name):
     """
-    Returns whether or not given user has access to Outlook mailbox
+    Returns whether or not given user has access to Outlook mailbox.
+
+    Valid results are cached for RESTCLIENTS_MSCA_VALID_USER_CACHE_TTL
+    seconds, invalid results for RESTCLIENTS_MSCA_INVALID_USER_CACHE_TTL
+    seconds, 0 (the default) disabling either cache.
     """
+    validated = _cached_validated_user(name)
+    if validated is not None:
+        return validated
+
     url = _msca_validate_user_url(name)
     response = get_resource(url)
-    return ValidatedUser().from_json(json.loads(response))
+    return _validated_user(name, response)
+
+
+def validate_users(names, max_workers=None):
+    """
+    Returns whether or not each of the distinct names has access to
+    Outlook mailbox, validated concurrently.
+
+    Returns a tuple of dicts: name to ValidatedUser, and name to the
+    exception raised validating it.
+    """
+    return map_concurrently(validate_user, names, max_workers=max_workers)
+
+
+def _validated_user(name, response):
+    validated = ValidatedUser().from_json(json.loads(response))
+    if validated.valid:
+        cache, ttl = VALID_USER_CACHE, _valid_user_cache_ttl()
+    else:
+        cache, ttl = INVALID_USER_CACHE, _invalid_user_cache_ttl()
+
+    if ttl > 0:
+        cache.set(name, validated, ttl=ttl)
+
+    return validated
+
+
+def _cached_validated_user(name):
+    """
+    Returns name's cached ValidatedUser, or None
+    """
+    if _valid_user_cache_ttl() > 0:
+        validated = VALID_USER_CACHE.get(name)
+        if validated is not None:
+            return validated
+
+    if _invalid_user_cache_ttl() > 0:
+        return INVALID_USER_CACHE.get(name)
+
+    return None
+
+
+def _valid_user_cache_ttl():
+    return int(getattr(
+        settings, 'RESTCLIENTS_MSCA_VALID_USER_CACHE_TTL', 0))
+
+
+def _invalid_user_cache_ttl():
+    return int(getattr(
+        settings, 'RESTCLIENTS_MSCA_INVALID_USER_CACHE_TTL', 0))
 
 
 def _msca_validate_user_url(name):